@@ -31,6 +31,7 @@ def default_hyps(user_surname: str) -> dict:
         'num_motor_start': 0,
         'num_motor_end': 5,
         'use_motors_step': 2,
+        'seed': None,               # зерно ГСЧ тестов (None — случайное)
 
         # --- MOLs‑тест -------------------------------------------------------
         'exps_for_each_motor': 3,
@@ -43,6 +44,7 @@ def default_hyps(user_surname: str) -> dict:
         'max_counter_samples': 20,  # сколько предъявлений всего
         'spatial_pwm': 30,          # базовый PWM для Spatial
         'spatial_mode': 'pairs',    # 'pairs' или 'single'
+        'spatial_pair_simultaneous': False,  # пара — одновременно (True) или по очереди
 
         # --- PM‑PWM‑тест -----------------------------------------------------
         'pmpwm_pwm_values': [14, 22, 36, 60, 100],
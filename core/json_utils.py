@@ -0,0 +1,37 @@
+# core/json_utils.py
+
+"""
+Чтение и запись JSON‑файлов результатов и отчётов.
+
+Если установлен ``orjson`` (необязательная зависимость), используется он —
+сериализация в нём на порядок быстрее стандартного ``json`` с ``indent``.
+Формат файлов в обоих случаях одинаковый: UTF‑8, отступ 2.
+"""
+
+import json
+from pathlib import Path
+
+try:                                # необязательная быстрая (де)сериализация
+    import orjson
+except ImportError:
+    orjson = None
+
+# Ключи‑числа (номера моторов) и скаляры NumPy — как в стандартном json
+_ORJSON_OPTS = (orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+                | orjson.OPT_SERIALIZE_NUMPY) if orjson else 0
+
+
+def load_json(path) -> object:
+    """Прочитать JSON‑файл (orjson, если установлен)."""
+    data = Path(path).read_bytes()
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+def dump_json(obj, path) -> None:
+    """Записать ``obj`` в UTF‑8 JSON с отступом 2 (orjson, если установлен)."""
+    path = Path(path)
+    if orjson:
+        path.write_bytes(orjson.dumps(obj, option=_ORJSON_OPTS))
+    else:
+        path.write_text(json.dumps(obj, ensure_ascii=False, indent=2),
+                        encoding="utf8")
@@ -7,12 +7,12 @@ MOLs‑тест (Minimum Observable Levels) — фоновый поток PyQt6.
 минимально ощущаемых порогов для каждого мотора вибробокса.
 """
 
-import random
-import time
 from typing import Dict, List
 
 import numpy as np
-from PyQt6.QtCore import QThread, pyqtSignal
+from PyQt6.QtCore import (
+    QDeadlineTimer, QMutex, QMutexLocker, QThread, QWaitCondition, pyqtSignal
+)
 
 from .serial_api import VibroBox
 
@@ -32,25 +32,50 @@ class MolsWorker(QThread):
     progress(int, int, int, str)
         motor_idx, текущий шаг, общее число шагов, текст
         «Увеличение/Уменьшение».
-    vibrationStarted()
-        Начало вибрации.
-    awaitingAnswer()
-        Запрос ответа пациента.
+    stateChanged(str)
+        Смена фазы шага: :attr:`STATE_VIBRATION` — начало вибрации,
+        :attr:`STATE_AWAITING` — запрос ответа пациента.
     finished(dict[int, int])
         Завершение теста, словарь «мотор → усреднённый порог PWM».
     """
 
     progress = pyqtSignal(int, int, int, str)
-    vibrationStarted   = pyqtSignal()
-    awaitingAnswer     = pyqtSignal()
+    stateChanged = pyqtSignal(str)
     finished = pyqtSignal(dict)
 
+    # Фазы шага (текст сразу пригоден для метки окна опроса)
+    STATE_VIBRATION = 'ВИБРАЦИЯ'
+    STATE_AWAITING  = 'Почувствовали?'
+
     def __init__(self, vibro: VibroBox, hyps: Dict):
         super().__init__()
         self.vibro = vibro
         self.hyps = hyps
         self._stop = False
 
+        # Постоянный буфер PWM: в _probe меняется только один элемент
+        self._pwm_buf = np.zeros(hyps['n_motors'], dtype=np.uint8)
+
+        # Генератор случайных чисел (PCG64) для порядка проходов и стартов;
+        # hyps["seed"] делает последовательность воспроизводимой
+        self._rng = np.random.default_rng(hyps.get('seed'))
+
+        # Последовательности PWM зависят только от hyps и случайного старта,
+        # поэтому строим их один раз для всех возможных стартов
+        down_tail = np.arange(20, hyps['end_pwm_down'], -2)
+        self._down_seqs = {
+            s: np.concatenate([np.arange(s, 20, hyps['delta_pwm_down']), down_tail])
+            for s in (30, 40)
+        }
+        self._up_seqs = {
+            s: np.arange(s, hyps['end_pwm_up'], hyps['delta_pwm_up'])
+            for s in range(2, 9)
+        }
+
+        # Ответ пациента и отмена будят поток через условную переменную
+        self._mutex = QMutex()
+        self._cond = QWaitCondition()
+
     # ------------------------------------------------------------------
     # Основной алгоритм
     # ------------------------------------------------------------------
@@ -64,10 +89,11 @@ class MolsWorker(QThread):
         total_steps = len(motors) * self.hyps['exps_for_each_motor'] * 2
         done = 0
 
+        # Направления проходов: поровну «вверх» (0) и «вниз» (1)
+        stream_plan = np.tile([0, 1], self.hyps['exps_for_each_motor'])
+
         for m in motors:
-            streams = [0, 1] * self.hyps['exps_for_each_motor']
-            random.shuffle(streams)
-            for direction in streams:
+            for direction in self._rng.permutation(stream_plan).tolist():
                 if self._stop:
                     return
 
@@ -76,10 +102,8 @@ class MolsWorker(QThread):
                 mode_text = ('Уменьшение мощности' if direction == 1 else 'Увеличение мощности')
                 self.progress.emit(m, done, total_steps, mode_text)
 
-                # === 1) Сигналим «ВИБРАЦИЯ» ===
-                self.vibrationStarted.emit()
-                
-                # === 2) Выполняем тест для этого направления ===
+                # === 1) Выполняем тест для этого направления ===
+                #        («ВИБРАЦИЯ» сигналит сам _probe перед каждым импульсом)
                 pwm = (self._downstream if direction == 1 else self._upstream)(m)
 
                 if pwm == -1:           # прервано внутри _probe
@@ -87,9 +111,9 @@ class MolsWorker(QThread):
 
                 results.setdefault(m, []).append(pwm)
 
-                # === 3) Индикатор конца и пауза ===
-                self.vibro.begin_end_indicator()
-                time.sleep(0.5)
+                # === 2) Индикатор конца и пауза ===
+                self.vibro.begin_end_indicator(sleep=self._sleep_s)
+                self._interruptible_sleep(500)
                 
 
         # Усредняем пороги и отдаём результат
@@ -102,24 +126,19 @@ class MolsWorker(QThread):
 
     def _downstream(self, motor_idx: int) -> int:
         """Проход с понижением мощности (поиск нижнего порога)."""
-        h = self.hyps
-        start_pwm = random.randint(3, 4) * 10
-        seq = np.concatenate([np.arange(start_pwm, 20, h['delta_pwm_down']),
-                              np.arange(20, h['end_pwm_down'], -2)])
-        return self._probe(seq, motor_idx, positive_answer='n')
+        start_pwm = int(self._rng.integers(3, 5)) * 10
+        return self._probe(self._down_seqs[start_pwm], motor_idx, positive_answer='n')
 
     def _upstream(self, motor_idx: int) -> int:
         """Проход с повышением мощности (поиск верхнего порога)."""
-        h = self.hyps
-        start_pwm = random.randint(2, 8)
-        seq = np.arange(start_pwm, h['end_pwm_up'], h['delta_pwm_up'])
-        return self._probe(seq, motor_idx, positive_answer='y')
+        start_pwm = int(self._rng.integers(2, 9))
+        return self._probe(self._up_seqs[start_pwm], motor_idx, positive_answer='y')
 
     def _probe(self, seq, motor_idx, positive_answer: str) -> int:
         """Общий проход по последовательности seq.  
         positive_answer : {"y", "n"} - буква, означающая «чувствую» или «не чувствую»."""
         h = self.hyps
-        pwm_arr = [0] * h['n_motors']
+        pwm_buf = self._pwm_buf
 
         for v in seq:
 
@@ -129,15 +148,14 @@ class MolsWorker(QThread):
                 return -1                      # специальный код «прервано»
 
             # === Сигнал «ВИБРАЦИЯ» перед включением мотора ===
-            self.vibrationStarted.emit()
-            pwm_arr[motor_idx] = v
-            self.vibro.set_pwm_values(pwm_arr)
-            time.sleep(0.5)
-            self.vibro.reset_pwm_values()
+            self.stateChanged.emit(self.STATE_VIBRATION)
+            pwm_buf[motor_idx] = v
+            self.vibro.pulse_pwm_values(pwm_buf, 0.5, self._sleep_s)
+            pwm_buf[motor_idx] = 0
             # time.sleep(0.1)
 
             # === Сигнал «Почувствовали?» перед ожиданием ответа ===
-            self.awaitingAnswer.emit()
+            self.stateChanged.emit(self.STATE_AWAITING)
             self.wait_for_patient()         # блокирующее ожидание сигнала из GUI
 
 
@@ -150,7 +168,7 @@ class MolsWorker(QThread):
             if self._patient_answer == positive_answer:
                 return int(v + abs(h['delta_pwm_down'] if positive_answer == 'n' else 0))
             
-            time.sleep(0.35)
+            self._interruptible_sleep(350)
 
         return int(abs(h['delta_pwm_down'])) if positive_answer == 'n' else int(h['end_pwm_up'])
 
@@ -162,13 +180,29 @@ class MolsWorker(QThread):
 
     def set_answer(self, ans: str):
         """Получить ответ пациента из GUI («y» / «n»)."""
-        self._patient_answer = ans
+        with QMutexLocker(self._mutex):
+            self._patient_answer = ans
+            self._cond.wakeAll()
 
     def wait_for_patient(self):
         """Блокирующее ожидание ответа пациента либо отмены теста."""
+        self._mutex.lock()
         self._patient_answer = ''
         while self._patient_answer == '' and not self._stop:
-            self.msleep(10)
+            self._cond.wait(self._mutex)
+        self._mutex.unlock()
+
+    def _sleep_s(self, seconds: float):
+        """То же, что :meth:`_interruptible_sleep`, но в секундах (для VibroBox)."""
+        self._interruptible_sleep(int(seconds * 1000))
+
+    def _interruptible_sleep(self, ms: int):
+        """Пауза на ``ms`` миллисекунд, которую :meth:`stop` прерывает сразу."""
+        deadline = QDeadlineTimer(ms)
+        self._mutex.lock()
+        while not self._stop and not deadline.hasExpired():
+            self._cond.wait(self._mutex, deadline)
+        self._mutex.unlock()
 
     # ------------------------------------------------------------------
     # Управление потоком
@@ -176,4 +210,6 @@ class MolsWorker(QThread):
 
     def stop(self):
         """Запросить досрочную остановку теста."""
-        self._stop = True
+        with QMutexLocker(self._mutex):
+            self._stop = True
+            self._cond.wakeAll()
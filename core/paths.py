@@ -7,17 +7,28 @@
 базовых имён выходных файлов с отметкой времени.
 """
 
+from functools import lru_cache
+from itertools import groupby
 from pathlib import Path
 from datetime import datetime
+import os
 import re
 
 # Корневая директория, где лежат все результаты тестов
 OUTPUT_ROOT = Path("outputs")
 
+# Формат отметки времени в именах файлов
+TS_FORMAT = "%Y-%m-%dT%H-%M-%S"
+
+# Каталоги, уже созданные за время работы программы (только для чтения:
+# пути записи создают каталог каждый раз — его могли удалить во время сеанса)
+_CREATED: set[Path] = set()
+
 # ---------------------------------------------------------------------------
 # Вспомогательные функции
 # ---------------------------------------------------------------------------
 
+@lru_cache(maxsize=128)
 def sanitize(name: str) -> str:
     """
     Убираем пробелы, точки и спец-символы из фамилии.
@@ -25,20 +36,57 @@ def sanitize(name: str) -> str:
     """
     return re.sub(r"[^A-Za-zА-Яа-я0-9_-]+", "_", name.strip()) or "anon"
 
+def timestamp() -> str:
+    """Текущее время в формате :data:`TS_FORMAT`."""
+    return datetime.now().strftime(TS_FORMAT)
+
+def _ensure_dir(p: Path, always: bool = False) -> Path:
+    """
+    mkdir только при первом обращении к каталогу. ``always=True`` — для
+    путей записи: каталог создаётся заново, даже если он уже в кэше.
+    """
+    if always or p not in _CREATED:
+        p.mkdir(parents=True, exist_ok=True)
+        _CREATED.add(p)
+    return p
+
+def patient_folder(surname: str) -> Path:
+    """
+    Возвращает .../outputs/<Фамилия>/  и гарантирует, что
+    она существует (каталог для записи summary — mkdir каждый раз).
+    """
+    return _ensure_dir(OUTPUT_ROOT / sanitize(surname), always=True)
+
 def test_folder(surname: str, test: str) -> Path:
     """
     Возвращает .../outputs/<Фамилия>/<test>/  и гарантирует, что
     она существует.
     """
-    p = OUTPUT_ROOT / sanitize(surname) / test
-    p.mkdir(parents=True, exist_ok=True)
-    return p
+    return _ensure_dir(OUTPUT_ROOT / sanitize(surname) / test)
 
 def build_file_base(surname: str, test: str) -> Path:
     """
     Базовое имя файлов БЕЗ расширения:
         outputs/<Фамилия>/<test>/<test>_<YYYY-MM-DDThh-mm-ss>
     """
-    ts   = datetime.now().strftime("%Y-%m-%dT%H-%M-%S")
-    base = test_folder(surname, test) / f"{test}_{ts}"
-    return base
+    # Путь записи: каталог создаём заново, не доверяя кэшу _CREATED
+    folder = _ensure_dir(OUTPUT_ROOT / sanitize(surname) / test, always=True)
+    return folder / f"{test}_{timestamp()}"
+
+def missing_files(paths) -> list[Path]:
+    """
+    Какие из ``paths`` не существуют как файлы.
+
+    Файлы группируются по каталогу: на каждый каталог один ``os.scandir``
+    вместо ``stat`` на каждый файл (заметно на сетевых дисках).
+    """
+    missing: list[Path] = []
+    for parent, group in groupby(sorted(paths, key=lambda p: p.parent),
+                                 key=lambda p: p.parent):
+        try:
+            with os.scandir(parent) as it:
+                existing = {e.name for e in it if e.is_file()}
+        except OSError:                 # каталога нет — нет и файлов
+            existing = set()
+        missing.extend(p for p in group if p.name not in existing)
+    return missing
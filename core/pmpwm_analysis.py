@@ -10,7 +10,6 @@ PWM‑значений уровней, а возвращает словарь с
 """
 
 from __future__ import annotations
-import itertools
 import numpy as np
 
 # ---------------------------------------------------------------------------
@@ -37,15 +36,17 @@ def _recommend(cm_norm: np.ndarray,
 
     # A) плохие уровни
     if bad:
-        # Группируем подряд идущие уровни с низкой точностью
-        bad.sort()
-        groups = [list(g) for _,g in
-                  itertools.groupby(bad, key=lambda x, c=itertools.count(): x-next(c))]
+        # Группируем подряд идущие уровни с низкой точностью:
+        # разрыв там, где соседние номера отличаются больше чем на 1
+        bad_arr = np.asarray(sorted(bad))
+        groups  = [g.tolist() for g in
+                   np.split(bad_arr, np.flatnonzero(np.diff(bad_arr) != 1) + 1)]
+        pwm_arr = np.asarray(pwm_vals)
         for g in groups:
             if len(g) == 1:
                 rec.append(f"Удалить уровень {g[0]} (PWM {pwm_vals[g[0]-1]}) — точность < 75 %")
             else:
-                new_pwm = round(np.mean([pwm_vals[i-1] for i in g]))
+                new_pwm = round(pwm_arr[np.asarray(g) - 1].mean())
                 rec.append(f"Объединить уровни {g} в один (~PWM {new_pwm})")
         return rec
 
@@ -77,10 +78,12 @@ def analyse_cm(cm: np.ndarray,
     pwm_vals   – список PWM-значений уровней, длиной N
     save_png   – путь для сохранения нормированной heat-map (или None)
     """
-    cm        = cm.astype(int)
-    cm_norm   = cm / cm.sum(axis=1, keepdims=True).clip(min=1)
-    acc       = {i+1: float(cm_norm[i, i])          for i in range(cm.shape[0])}
-    mean_acc  = float(np.mean(list(acc.values())))
+    cm        = np.asarray(cm, dtype=int)
+    row_sums  = np.maximum(cm.sum(axis=1), 1)
+    cm_norm   = cm / row_sums[:, None]
+    diag      = np.diagonal(cm) / row_sums                  # точность по уровням
+    acc       = dict(enumerate(diag.tolist(), start=1))
+    mean_acc  = float(diag.mean())
     recs      = _recommend(cm_norm, acc, pwm_vals)
 
     return {
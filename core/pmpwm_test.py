@@ -12,11 +12,12 @@ Qt. Класс управляет вибробоксом, собирает от
 """
 
 from __future__ import annotations
-import random, time
 from typing import Dict, List, Sequence
 
 import numpy as np
-from PyQt6.QtCore import QThread, pyqtSignal
+from PyQt6.QtCore import (
+    QDeadlineTimer, QMutex, QMutexLocker, QThread, QWaitCondition, pyqtSignal
+)
 
 from core.serial_api import VibroBox
 
@@ -48,7 +49,20 @@ class PMPWMWorker(QThread):
         self._answer: int | None = None
         self._stop  = False
 
-        self.results: dict[int, list[tuple[int, int]]] = {}
+        # Ответ пациента и отмена будят поток через условную переменную
+        self._mutex = QMutex()
+        self._cond  = QWaitCondition()
+
+        # Буфер стимула: живёт всё время работы потока, вне предъявления — нули
+        self._stim  = np.zeros(vibro.n_motors, dtype=np.uint8)
+
+        # Генератор случайных чисел (PCG64) для порядка предъявлений;
+        # hyps["seed"] делает последовательность воспроизводимой
+        self._rng   = np.random.default_rng(hyps.get('seed'))
+
+        # {мотор: массив (N, 2) uint8 пар (истинный уровень, ответ)};
+        # мотор попадает сюда только целиком завершённым
+        self.results: dict[int, np.ndarray] = {}
 
     # ------------------------------------------------------------------
     # Интерфейс для GUI
@@ -56,11 +70,44 @@ class PMPWMWorker(QThread):
 
     def set_answer(self, val: int):
         """Получить ответ пациента (уровень 1…N)."""
-        self._answer = val
+        with QMutexLocker(self._mutex):
+            self._answer = val
+            self._cond.wakeAll()
 
     def stop(self):
         """Запросить досрочную остановку теста."""
-        self._stop = True
+        with QMutexLocker(self._mutex):
+            self._stop = True
+            self._cond.wakeAll()
+
+    def restart(self, motors: Sequence[int]):
+        """
+        Повторно запустить уже отработавший поток для новой очереди моторов.
+
+        Объект и подключённые сигналы сохраняются, накопленные ``results``
+        остаются (мотор перезаписывается при повторном прогоне).
+        """
+        with QMutexLocker(self._mutex):
+            self.motors = list(motors)
+            self._answer = None
+            self._stop = False
+        self.start()
+
+    # ------------------------------------------------------------------
+    # Частные методы
+    # ------------------------------------------------------------------
+
+    def _sleep_s(self, seconds: float):
+        """То же, что :meth:`_interruptible_sleep`, но в секундах (для VibroBox)."""
+        self._interruptible_sleep(int(seconds * 1000))
+
+    def _interruptible_sleep(self, ms: int):
+        """Пауза на ``ms`` миллисекунд, которую :meth:`stop` прерывает сразу."""
+        deadline = QDeadlineTimer(ms)
+        self._mutex.lock()
+        while not self._stop and not deadline.hasExpired():
+            self._cond.wait(self._mutex, deadline)
+        self._mutex.unlock()
 
     # ------------------------------------------------------------------
     # Основной алгоритм (QThread.run)
@@ -73,65 +120,70 @@ class PMPWMWorker(QThread):
         repeats    = h['pmpwm_repeats']
         n_levels   = len(pwm_values)
 
-        # Итоговые данные
-        answers: list[tuple[int, int]] = []
-        
         # Локальный подсчёт только для одного мотора
         local_total = n_levels * repeats
+        stim        = self._stim
+
+        # План предъявлений — индексы уровней 0…N‑1, каждый repeats раз;
+        # для каждого мотора берём случайную перестановку
+        level_plan = np.tile(np.arange(n_levels), repeats)
 
-        # Подготовка последовательности PWM для каждого мотора
         for motor in self.motors:
-            seq = pwm_values * repeats
-            random.shuffle(seq)
+            seq = self._rng.permutation(level_plan).tolist()
 
-            # Обнуляем, если «переписываем» мотор
-            self.results[motor] = []
+            # Обнуляем, если «переписываем» мотор; ответы копим в буфере
+            self.results.pop(motor, None)
+            buf = np.empty((local_total, 2), dtype=np.uint8)
 
-            for step_local, pwm in enumerate(seq, start=1):
+            for step_local, lvl_idx in enumerate(seq, start=1):
+                pwm = pwm_values[lvl_idx]
 
                 # 0) Сообщаем GUI о текущем шаге
                 self.progress.emit(motor, step_local, local_total)
 
                 # 1) Вибрация
-                arr = np.zeros(self.vibro.n_motors, dtype=np.uint8)
-                arr[motor] = pwm
-                self.vibro.set_pwm_values(arr)
-                time.sleep(h.get('time_sleep_param', 0.25))
-                self.vibro.reset_pwm_values()
+                stim[motor] = pwm
+                self.vibro.pulse_pwm_values(stim, h.get('time_sleep_param', 0.25), self._sleep_s)
+                stim[motor] = 0
 
                 # 2) Ждём ответ
-                self._answer = None
+                with QMutexLocker(self._mutex):
+                    self._answer = None
                 self.awaitingAnswer.emit()
+                self._mutex.lock()
                 while self._answer is None and not self._stop:
-                    self.msleep(10)
+                    self._cond.wait(self._mutex)
+                self._mutex.unlock()
                 if self._stop:
                     self.vibro.reset_pwm_values()
                     return
 
                 # 3) Записываем ответ
-                true_level = pwm_values.index(pwm) + 1
-                self.results[motor].append((true_level, int(self._answer)))
+                buf[step_local - 1] = (lvl_idx + 1, self._answer)
 
-                time.sleep(0.35)
+                self._interruptible_sleep(350)
 
             # 5) мотор завершён
+            self.results[motor] = buf
             self.motorFinished.emit(motor)
 
         # Индикация конца теста
-        self.vibro.begin_end_indicator()
+        self.vibro.begin_end_indicator(sleep=self._sleep_s)
 
         # ------------------------------------------------------------------
         # Пост‑обработка результатов
         # ------------------------------------------------------------------
 
-        answers = sum(self.results.values(), [])
-
-        correct = sum(1 for t, p in answers if t == p)
+        ans_arr = np.concatenate([np.empty((0, 2), dtype=np.uint8),
+                                  *self.results.values()]).astype(np.int64)
+        answers = ans_arr.tolist()
 
+        # Матрица ошибок одним bincount по плоскому индексу (t‑1)·N + (p‑1)
         levels = n_levels
-        cm = np.zeros((levels, levels), dtype=int)
-        for t, p in answers:
-            cm[t-1, p-1] += 1
+        flat = (ans_arr[:, 0] - 1) * levels + (ans_arr[:, 1] - 1)
+        cm = np.bincount(flat, minlength=levels * levels).reshape(levels, levels)
+
+        correct = int(np.trace(cm))
 
         per_level_acc = cm.diagonal() / cm.sum(axis=1).clip(min=1)
 
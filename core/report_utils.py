@@ -18,10 +18,9 @@
     }
 """
 
-import json
 from pathlib import Path
-from datetime import datetime
-from core.paths import OUTPUT_ROOT, sanitize
+from core.json_utils import dump_json, load_json
+from core.paths import patient_folder, timestamp
 from core.pmpwm_analysis import analyse_cm
 from core.spatial_analysis import analyse_spatial
 import numpy as np
@@ -50,8 +49,7 @@ def generate_summary(sel: dict) -> Path:
     # ------------------------------------------------------------------
 
     # ---------- 1-A. PM-PWM -------------------------------------------
-    with open(sel["pmpwm"], encoding="utf8") as f:
-        src = json.load(f)
+    src = load_json(sel["pmpwm"])
 
     pwm_values   = src["pwm_values"]
     conf_by_mtr  = {int(k): np.array(v)
@@ -60,22 +58,21 @@ def generate_summary(sel: dict) -> Path:
     # ---------- 1-B. MOLs ---------------------------------------------
     mols_data = None
     if sel.get("mols"):
-        with open(sel["mols"], encoding="utf8") as f:
-            mols_data = {int(k): int(v) for k, v in json.load(f).items()}  # {motor: pwm}
+        mols_data = {int(k): int(v)
+                     for k, v in load_json(sel["mols"]).items()}  # {motor: pwm}
     
     # ---------- 1-C. Spatial (.npy) -----------------------------------
     spatial_data = None
     if sel.get("spatial"):
-        answers = np.load(sel["spatial"]).tolist()  # [(true,pred)…]
+        answers = np.load(sel["spatial"], mmap_mode="r")  # (N, 2): true, pred
         spatial_data = analyse_spatial(answers)
 
     # ------------------------------------------------------------------
     # 2. Каталог пациента и метка времени
     # ------------------------------------------------------------------
 
-    surname_root = OUTPUT_ROOT / sanitize(sel["surname"])
-    surname_root.mkdir(parents=True, exist_ok=True)
-    ts           = datetime.now().strftime("%Y-%m-%dT%H-%M-%S")
+    surname_root = patient_folder(sel["surname"])
+    ts           = timestamp()
 
     # ------------------------------------------------------------------
     # 3. Анализируем каждый мотор PM‑PWM
@@ -100,51 +97,56 @@ def generate_summary(sel: dict) -> Path:
     }
 
     json_path = surname_root / f"summary_{ts}.json"
-    json_path.write_text(json.dumps(out_json, ensure_ascii=False, indent=2),
-                         encoding="utf8")
+    dump_json(out_json, json_path)
 
     # Человеко-читаемый TXT (кратко)
     txt_path = surname_root / f"summary_{ts}.txt"
-    
+
+    # Текст собираем в список строк и записываем одним вызовом
+    parts: list[str] = []
+    out = parts.append
+
+    # 0) Фамилия
+    out(f"Фамилия: {sel['surname']}\n\n")
+
+    # 1) MOLs-тест
+    out("===  MOLs-тест ===\n")
+    if mols_data:
+        for m, pwm in sorted(mols_data.items()):
+            out(f"{m} → {pwm} PWM\n")
+    else:
+        out("Файл не выбран\n")
+    out("\n")
+
+    # 2) Spatial-тест
+    out("===  Spatial-тест ===\n")
+    if spatial_data:
+        for reg, st in sorted(spatial_data["regions"].items()):
+            acc = st["accuracy"] * 100
+            out(f"{reg} область: {acc:.0f} %\n")
+            if acc < 100:
+                out("    Ответы:\n")
+                for ans, n in st["answers"].items():
+                    out(f"        {ans} область – {n}\n")
+        out(f"\nСредняя точность: "
+            f"{spatial_data['mean_accuracy']*100:.1f} %\n")
+    else:
+        out("Файл не выбран\n")
+    out("\n")
+
+    # 3) PM-PWM-тест
+    out("===  PM-PWM-тест ===\n")
+    for m, r in sorted(summary_per_motor.items()):
+        out(f"Мотор {m}: средняя точность {r['mean_accuracy']*100:4.1f} %\n")
+        for k, a in r["accuracy"].items():
+            out(f"  Уровень {k}: {a*100:4.1f} %\n")
+        out("  Рекомендации:\n")
+        for rec in r["recommendations"]:
+            out(f"   • {rec}\n")
+        out("\n")
+
     with open(txt_path, "w", encoding="utf8") as f:
-        # 0) Фамилия
-        f.write(f"Фамилия: {sel['surname']}\n\n")
-
-        # 1) MOLs-тест
-        f.write("===  MOLs-тест ===\n")
-        if mols_data:
-            for m, pwm in sorted(mols_data.items()):
-                f.write(f"{m} → {pwm} PWM\n")
-        else:
-            f.write("Файл не выбран\n")
-        f.write("\n")
-
-        # 2) Spatial-тест
-        f.write("===  Spatial-тест ===\n")
-        if spatial_data:
-            for reg, st in sorted(spatial_data["regions"].items()):
-                acc = st["accuracy"] * 100
-                f.write(f"{reg} область: {acc:.0f} %\n")
-                if acc < 100:
-                    f.write("    Ответы:\n")
-                    for ans, n in st["answers"].items():
-                        f.write(f"        {ans} область – {n}\n")
-            f.write(f"\nСредняя точность: "
-                    f"{spatial_data['mean_accuracy']*100:.1f} %\n")
-        else:
-            f.write("Файл не выбран\n")
-        f.write("\n")
-
-        # 3) PM-PWM-тест
-        f.write("===  PM-PWM-тест ===\n")
-        for m, r in sorted(summary_per_motor.items()):
-            f.write(f"Мотор {m}: средняя точность {r['mean_accuracy']*100:4.1f} %\n")
-            for k, a in r["accuracy"].items():
-                f.write(f"  Уровень {k}: {a*100:4.1f} %\n")
-            f.write("  Рекомендации:\n")
-            for rec in r["recommendations"]:
-                f.write(f"   • {rec}\n")
-            f.write("\n")
+        f.write("".join(parts))
 
     # Вызов функции, которая будет делать report по необходимым стандартам
     create_report()
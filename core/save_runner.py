@@ -0,0 +1,53 @@
+# core/save_runner.py
+
+"""
+Фоновое сохранение результатов тестов.
+
+Модуль содержит класс :class:`SaveRunner` — задачу для ``QThreadPool``,
+которая выполняет запись файлов (JSON, NPY, PNG) вне GUI‑потока и сообщает
+о результате сигналом. Окно при этом остаётся отзывчивым.
+"""
+
+from typing import Callable
+
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+
+
+class SaveSignals(QObject):
+    """
+    Сигналы задачи сохранения (``QRunnable`` сам сигналов не имеет).
+
+    Сигналы класса
+    --------------
+    done(dict info)
+        Сохранение завершено; ``info`` — то, что вернула функция‑задача.
+    failed(str message)
+        Функция‑задача завершилась исключением.
+    """
+    done = pyqtSignal(dict)
+    failed = pyqtSignal(str)
+
+
+class SaveRunner(QRunnable):
+    """
+    Задача пула потоков: вызывает ``job()`` и отправляет сигнал с итогом.
+
+    Параметры
+    ----------
+    job : Callable[[], dict]
+        Функция, выполняющая запись файлов. Не должна трогать виджеты —
+        она работает вне GUI‑потока.
+    """
+
+    def __init__(self, job: Callable[[], dict]):
+        super().__init__()
+        self.job = job
+        self.signals = SaveSignals()
+
+    def run(self):
+        try:
+            info = self.job()
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.done.emit(info or {})
@@ -9,24 +9,98 @@ Pi Pico, на котором стоит прошивка для управле
 
 * автоматический поиск и подключение по VID/PID/описанию;
 * методы выставления массива PWM‑значений;
-* служебные индикаторы начала/конца теста;
+* неблокирующую запись кадров из GUI‑потока (через пул потоков Qt);
+* служебные индикаторы начала/конца теста (блокирующий и на таймерах Qt);
 * полный сброс моторов.
 """
 
 import time
-from typing import Optional, Sequence
+from functools import partial
+from typing import Callable, Optional, Sequence
 
 import numpy as np
 import serial
 from serial.tools import list_ports
-
-class VibroBox:
-
-    """Доступ к плате VibroBox через USB‑Serial."""
+from PyQt6.QtCore import QMutex, QMutexLocker, QObject, QThreadPool, QTimer, pyqtSignal
+
+# Пауза после мигания индикатора до сигнала indicatorDone: первый стимул
+# теста не должен сливаться с миганием в «третий импульс» индикатора
+INDICATOR_SETTLE_MS = 1500
+
+# Кэш подходящих COM‑портов: на Windows comports() — медленный опрос реестра
+_PORTS_CACHE: Optional[list[str]] = None
+
+def _candidate_ports(refresh: bool = False) -> list[str]:
+    """Список устройств, похожих на VibroBox (кэшируется до ``refresh``)."""
+    global _PORTS_CACHE
+    if refresh or _PORTS_CACHE is None:
+        _PORTS_CACHE = [p.device for p in list_ports.comports()
+                        if 'Устройство' in p.description]
+    return _PORTS_CACHE
+
+
+class _FrameSender:
+    """
+    Отправка кадров PWM вне вызывающего (GUI‑)потока — задачей ``QThreadPool``.
+
+    Хранится только последний кадр: если предыдущая запись ещё идёт,
+    промежуточные кадры заменяются новым — важно лишь итоговое состояние
+    моторов. Одновременно работает не больше одной задачи, поэтому кадры
+    уходят в порт в порядке вызовов :meth:`post`.
+    """
+
+    def __init__(self, send: Callable[[np.ndarray, bool], None]):
+        self._send  = send
+        self._mutex = QMutex()
+        self._frame: Optional[np.ndarray] = None
+        self._flush = False
+        self._busy  = False
+
+    def post(self, frame: Sequence[int], flush: bool) -> None:
+        """Поставить кадр на отправку и сразу вернуть управление."""
+        with QMutexLocker(self._mutex):
+            # Копия: вызывающий может сразу переиспользовать свой буфер
+            self._frame = np.array(frame, dtype=np.uint8)
+            self._flush = flush
+            if self._busy:
+                return
+            self._busy = True
+        QThreadPool.globalInstance().start(self._drain)
+
+    def _drain(self) -> None:
+        while True:
+            with QMutexLocker(self._mutex):
+                frame, flush, self._frame = self._frame, self._flush, None
+                if frame is None:
+                    self._busy = False
+                    return
+            try:
+                self._send(frame, flush)
+            except (serial.SerialException, RuntimeError):
+                pass    # порт недоступен — кадр теряется, окно продолжает работать
+
+
+class VibroBox(QObject):
+
+    """
+    Доступ к плате VibroBox через USB‑Serial.
+
+    Сигналы класса
+    --------------
+    indicatorDone()
+        Неблокирующий индикатор :meth:`begin_end_indicator_async` отработал,
+        моторы выключены.
+    """
+    indicatorDone = pyqtSignal()
 
     def __init__(self, n_motors: int = 10):
+        super().__init__()
         self.n_motors = n_motors
         self.ser: Optional[serial.Serial] = None
+        # Готовый кадр «все моторы выключены» для reset_pwm_values
+        self._zero_frame = np.zeros(n_motors, dtype=np.uint8)
+        # Неблокирующая запись для GUI‑потока (см. set_pwm_values_async)
+        self._sender = _FrameSender(self._send_frame)
 
     # ------------------------------------------------------------------
     # Соединение
@@ -36,12 +110,18 @@ class VibroBox:
         """
         Автоматически находит плату в списке COM‑портов и подключается.
         Возвращает ``True``, если соединение успешно, иначе ``False``.
+
+        Сначала пробуем закэшированный список портов; если ни один не
+        подошёл — заново перечисляем порты (плату могли переподключить).
         """
-        ports = list_ports.comports()
-        for p in ports:
-            if 'Устройство' in p.description:
+        for refresh in (False, True):
+            for device in _candidate_ports(refresh):
                 try:
-                    self.ser = serial.Serial(p.device)
+                    # Запись блокирующая: write() возвращается, когда ОС
+                    # приняла кадр целиком. GUI‑поток пишет через _FrameSender
+                    self.ser = serial.Serial(device)
+                    if hasattr(self.ser, 'set_buffer_size'):   # только Windows
+                        self.ser.set_buffer_size(rx_size=4096, tx_size=4096)
                     return True
                 except serial.SerialException:
                     pass
@@ -55,8 +135,13 @@ class VibroBox:
         """Отправить массив PWM как сырые байты (uint8[N])."""
         if not self.ser:
             raise RuntimeError('VibroBox not connected')
-        data = np.array(arr, dtype=np.uint8).tobytes()
-        self.ser.write(data)
+        # Для готового uint8‑массива asarray не делает копии
+        self.ser.write(np.asarray(arr, dtype=np.uint8).tobytes())
+
+    def flush(self) -> None:
+        """Дождаться фактической отправки всех записанных байтов."""
+        if self.ser:
+            self.ser.flush()
 
     def set_pwm_values(self, pwm_values: Sequence[int]) -> None:
         """
@@ -69,16 +154,85 @@ class VibroBox:
 
     def reset_pwm_values(self) -> None:
         """Отключить все моторы (установить PWM = 0)."""
-        self.set_pwm_values([0] * self.n_motors)
+        self._write_array(self._zero_frame)
+
+    def pulse_pwm_values(self, pwm_values: Sequence[int], duration: float,
+                         sleep: Callable[[float], None] = time.sleep) -> None:
+        """
+        Импульс «включить на ``duration`` секунд, затем выключить всё» одним
+        вызовом. Таймера в прошивке нет, поэтому это по‑прежнему два кадра;
+        ``sleep`` — функция паузы, как в :meth:`begin_end_indicator`.
+        """
+        self.set_pwm_values(pwm_values)
+        sleep(duration)
+        self.reset_pwm_values()
+
+    # ------------------------------------------------------------------
+    # Неблокирующие команды (для GUI‑потока)
+    # ------------------------------------------------------------------
+
+    def _send_frame(self, frame: np.ndarray, flush: bool) -> None:
+        self._write_array(frame)
+        if flush:
+            self.flush()
+
+    def set_pwm_values_async(self, pwm_values: Sequence[int]) -> None:
+        """
+        То же, что :meth:`set_pwm_values`, но запись идёт в пуле потоков,
+        а вызов возвращается сразу. Если порт ещё занят, из серии кадров
+        отправляется последний. Не смешивать с синхронными вызовами из
+        других потоков в одно и то же время.
+        """
+        if len(pwm_values) != self.n_motors:
+            raise ValueError('Length of pwm_values must equal n_motors')
+        self._sender.post(pwm_values, False)
+
+    def reset_pwm_values_async(self) -> None:
+        """Неблокирующий вариант :meth:`reset_pwm_values`."""
+        self._sender.post(self._zero_frame, True)
 
     # ------------------------------------------------------------------
     # Визуально‑тактильный индикатор начала/конца теста
     # ------------------------------------------------------------------
 
-    def begin_end_indicator(self, val: int = 20, repeats: int = 2, pause: float = .25):
-        """Мигание всеми моторами для сигнала «старт/стоп теста»."""
+    def begin_end_indicator(self, val: int = 20, repeats: int = 2, pause: float = .25,
+                            sleep: Callable[[float], None] = time.sleep):
+        """
+        Мигание всеми моторами для сигнала «старт/стоп теста».
+
+        ``sleep`` — функция паузы (секунды). Фоновые потоки передают сюда
+        свою прерываемую паузу, чтобы отмена теста не ждала конца мигания.
+        """
+        frame = np.full(self.n_motors, val, dtype=np.uint8)
         for _ in range(repeats):
-            self.set_pwm_values([val] * self.n_motors)
-            time.sleep(pause)
-            self.reset_pwm_values()
-            time.sleep(pause)
+            self.pulse_pwm_values(frame, pause, sleep)
+            sleep(pause)
+
+    def begin_end_indicator_async(self, val: int = 20, repeats: int = 2,
+                                  pause: float = .25) -> None:
+        """
+        То же мигание, но без блокировки GUI‑потока: шаги идут по
+        ``QTimer.singleShot``. :attr:`indicatorDone` испускается через
+        :data:`INDICATOR_SETTLE_MS` после мигания. Если шаг не удался (порт
+        недоступен), подписчики ``indicatorDone`` отключаются — одноразовый
+        слот не сработает в следующем тесте.
+        """
+        frame = np.full(self.n_motors, val, dtype=np.uint8)
+        steps = [partial(self.set_pwm_values, frame), self.reset_pwm_values] * repeats
+        pause_ms = int(pause * 1000)
+
+        def _step(i: int = 0) -> None:
+            if i == len(steps):
+                QTimer.singleShot(INDICATOR_SETTLE_MS, self.indicatorDone.emit)
+                return
+            try:
+                steps[i]()
+            except Exception:
+                try:
+                    self.indicatorDone.disconnect()
+                except TypeError:       # подписчиков нет
+                    pass
+                raise
+            QTimer.singleShot(pause_ms, partial(_step, i + 1))
+
+        _step()
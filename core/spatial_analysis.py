@@ -9,40 +9,78 @@
 """
 
 from __future__ import annotations
-from collections import defaultdict
+from itertools import chain
 from typing import Iterable
 
-def analyse_spatial(answers: Iterable[tuple[int,int]]) -> dict:
+import numpy as np
+
+# ---------------------------------------------------------------------------
+# Внутренние вспомогательные функции
+# ---------------------------------------------------------------------------
+
+def _aggregate(trues: np.ndarray, preds: np.ndarray):
+    """
+    Ядро подсчёта: один проход bincount по парам (истина, ответ).
+
+    Возвращает
+    ----------
+    vals   : номера областей (отсортированы), индекс k ↔ область vals[k]
+    order  : индексы истинных областей в порядке первого появления
+    hist   : матрица K×K «истина × ответ»
+    totals : число предъявлений каждой области (суммы строк hist)
+    correct: число верных ответов по каждой области (диагональ hist)
+    """
+    vals, inv = np.unique(np.concatenate((trues, preds)), return_inverse=True)
+    t, p = inv[:len(trues)], inv[len(trues):]
+    k    = len(vals)
+    hist = np.bincount(t * k + p, minlength=k * k).reshape(k, k)
+
+    _, first = np.unique(t, return_index=True)
+    order    = t[np.sort(first)]
+    return vals, order, hist, hist.sum(axis=1), np.diagonal(hist)
+
+# ---------------------------------------------------------------------------
+# Публичная функция
+# ---------------------------------------------------------------------------
+
+def analyse_spatial(answers: Iterable[tuple[int,int]] | np.ndarray) -> dict:
     """
     Собирает статистику по Spatial‑тесту.
 
     Параметры
     ----------
-    answers : Iterable[tuple[int, int]]
-        Итератор кортежей ``(ожидаемая_область, ответ_пациента)``.
+    answers : Iterable[tuple[int, int]] | np.ndarray
+        Итератор кортежей ``(ожидаемая_область, ответ_пациента)``
+        или массив формы (N, 2).
 
     Возвращает
     ----------
     dict
         Словарь со статистикой по областям и средней точностью.
     """
-    # --- 1. Агрегация по областям ------------------------------------
+    # --- 1. Двумерная гистограмма «истина × ответ» -------------------
+    # ndarray (в т. ч. memmap из .npy) берём как есть, без копии в кортежи;
+    # итератор пар разворачиваем в плоский поток чисел одним fromiter
+    if isinstance(answers, np.ndarray):
+        a = np.asarray(answers, dtype=np.int64).reshape(-1, 2)
+    else:
+        a = np.fromiter(chain.from_iterable(answers), dtype=np.int64).reshape(-1, 2)
+    vals, order, hist, totals, correct = _aggregate(a[:, 0], a[:, 1])
+
+    # --- 2. Статистика по областям (в порядке первого появления) ----
+    regions = vals.tolist()
+    totals, correct = totals.tolist(), correct.tolist()
     stats: dict[int, dict] = {}
-    for true, pred in answers:
-        st = stats.setdefault(true,
-                {'total': 0, 'correct': 0,
-                 'answers': defaultdict(int)})
-        st['total']   += 1
-        st['correct'] += int(true == pred)
-        st['answers'][pred] += 1
-
-    # --- 2. Подсчёт точности и сортировка ---------------------------
-    for r, st in stats.items():
-        st['accuracy'] = st['correct'] / max(1, st['total'])
-        st['answers']  = dict(sorted(st['answers'].items()))
+    for i in order.tolist():
+        row = hist[i]
+        stats[regions[i]] = {
+            'total'   : totals[i],
+            'correct' : correct[i],
+            'answers' : {regions[j]: int(row[j]) for j in np.flatnonzero(row)},
+            'accuracy': correct[i] / max(1, totals[i]),
+        }
 
     # --- 3. Средняя точность ----------------------------------------
-    mean_acc = (sum(st['correct'] for st in stats.values()) /
-                max(1, sum(st['total']   for st in stats.values())))
+    mean_acc = sum(correct) / max(1, len(a))
 
     return {'regions': stats, 'mean_accuracy': mean_acc}
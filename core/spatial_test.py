@@ -8,8 +8,12 @@ Spatial‑тест — распознавание пространственны
 последовательно предъявляет стимулы и собирает ответы пациента.
 """
 
-from PyQt6.QtCore import QThread, pyqtSignal
-import numpy as np, random, time
+from PyQt6.QtCore import (
+    QDeadlineTimer, QMutex, QMutexLocker, QThread, QWaitCondition, pyqtSignal
+)
+from functools import partial
+
+import numpy as np
 from core.serial_api import VibroBox
 
 class SpatialWorker(QThread):
@@ -23,7 +27,8 @@ class SpatialWorker(QThread):
     awaitingAnswer()
         Импульс отправлен — ожидаем ответ пациента.
     finished(dict result)
-        Словарь с полями ``answers`` и ``mode``.
+        Словарь с полями ``answers`` (``ndarray`` (N, 2) int16: истинная
+        область, ответ) и ``mode``.
     
     Параметры
     ----------
@@ -47,17 +52,68 @@ class SpatialWorker(QThread):
         self._answer = None
         self._stop = False
 
+        # Генератор случайных чисел (PCG64) для порядка предъявлений;
+        # hyps["seed"] делает последовательность воспроизводимой
+        self._rng = np.random.default_rng(hyps.get('seed'))
+
+        # Буфер стимула: вне предъявления — нули
+        self._vals = np.zeros(hyps['n_motors'], dtype=np.uint8)
+
+        # Ответ пациента и отмена будят поток через условную переменную
+        self._mutex = QMutex()
+        self._cond = QWaitCondition()
+
     # ------------------------------------------------------------------
     # API для GUI
     # ------------------------------------------------------------------
 
     def set_answer(self, value: int):
         """Получить ответ пациента (номер области)."""
-        self._answer = value
+        with QMutexLocker(self._mutex):
+            self._answer = value
+            self._cond.wakeAll()
 
     def stop(self):
         """Запросить досрочное завершение теста."""
-        self._stop = True
+        with QMutexLocker(self._mutex):
+            self._stop = True
+            self._cond.wakeAll()
+
+    # ------------------------------------------------------------------
+    # Частные методы
+    # ------------------------------------------------------------------
+
+    def _interruptible_sleep(self, ms: int):
+        """Пауза на ``ms`` миллисекунд, которую :meth:`stop` прерывает сразу."""
+        deadline = QDeadlineTimer(ms)
+        self._mutex.lock()
+        while not self._stop and not deadline.hasExpired():
+            self._cond.wait(self._mutex, deadline)
+        self._mutex.unlock()
+
+    def _present_single(self, m0: int, pwm: int, sleep_ms: int):
+        """Импульс одного мотора ``m0``."""
+        vals  = self._vals
+        valid = 0 <= m0 < len(vals)
+        if valid:
+            vals[m0] = pwm
+        self.vibro.set_pwm_values(vals)
+        if valid:
+            vals[m0] = 0
+        self._interruptible_sleep(sleep_ms)
+
+    def _present_pair(self, m0: int, pwm: int, sleep_ms: int, simultaneous: bool):
+        """Импульс пары ``m0, m0+1``: по очереди либо одним кадром."""
+        if not simultaneous:
+            self._present_single(m0, pwm, sleep_ms)
+            self._present_single(m0 + 1, pwm, sleep_ms)
+            return
+        vals   = self._vals
+        lo, hi = max(m0, 0), min(m0 + 2, len(vals))     # валидная часть пары
+        vals[lo:hi] = pwm
+        self.vibro.set_pwm_values(vals)
+        vals[lo:hi] = 0
+        self._interruptible_sleep(sleep_ms)
 
     # ------------------------------------------------------------------
     # Основной алгоритм (QThread.run)
@@ -85,63 +141,75 @@ class SpatialWorker(QThread):
         count_uses  = len(uses)                   # сколько разных областей мы используем
         q, r = divmod(max_samples, count_uses)    # целые «полные» циклы и остаток
 
-        # q полных повторов и r случайных дополнительных
-        seq = []
-        for _ in range(q):
-            seq.extend(uses)                      # добавляем полный набор областей q раз
-        if r > 0:
-            seq.extend(random.sample(uses, r))    # + r случайных, чтобы довести счётчик
+        # q полных повторов и r случайных дополнительных (без повторов)
+        uses_arr = np.asarray(uses, dtype=np.int32)
+        seq = np.concatenate([np.tile(uses_arr, q),
+                              self._rng.choice(uses_arr, r, replace=False)])
 
-        # Затем перемешиваем
-        random.shuffle(seq)
+        # Затем перемешиваем; номера областей считаем сразу для всех шагов
+        self._rng.shuffle(seq)
+        total = len(seq)
 
+        # Буфер ответов (истина, ответ): размер известен заранее, столбец
+        # истинных областей заполняется сразу, в цикле — только ответ
+        answers = np.empty((total, 2), dtype=np.int16)
+        answers[:, 0] = (seq - start) // step + 1
+        n_done  = 0                             # сколько ответов получено
+        seq = seq.tolist()                      # в цикле работаем с обычными int
 
-        answers = []
-        total = len(seq)
+        # Способ предъявления выбираем один раз, а не на каждом шаге
+        pwm      = h.get('spatial_pwm', 0)
+        sleep_ms = int(h.get('time_sleep_param', 0.25) * 1000)
+        if self.mode == 'pairs':
+            present = partial(self._present_pair, pwm=pwm, sleep_ms=sleep_ms,
+                              simultaneous=h.get('spatial_pair_simultaneous', False))
+        else:
+            present = partial(self._present_single, pwm=pwm, sleep_ms=sleep_ms)
+
+        # Всё, что не меняется между предъявлениями, — в локальные имена
+        reset_pwm     = self.vibro.reset_pwm_values
+        emit_progress = self.progress.emit
+        last_pct      = -1                      # прогресс шлём при смене процента
 
         for idx, m0 in enumerate(seq):
             if self._stop:
                 break
 
-            self.progress.emit(idx + 1, total)
-
-            # --- Определяем моторы для стимуляции и true_region ---
-            if self.mode == 'pairs':
-                motors = (m0, m0 + 1)
-                true_region = (m0 - start) // step + 1
-            else:
-                motors = (m0,)
-                true_region = (m0 - start) // step + 1
+            pct = (idx + 1) * 100 // total
+            if pct != last_pct:
+                emit_progress(idx + 1, total)
+                last_pct = pct
 
             # --- Подаём вибрацию ----------------------------------
-            for mot in motors:
-                vals = np.zeros(h['n_motors'], dtype=np.uint8)
-                if 0 <= mot < h['n_motors']:
-                    vals[mot] = h.get('spatial_pwm', 0)
-                self.vibro.set_pwm_values(vals)
-                time.sleep(h.get('time_sleep_param', 0.25))
-            self.vibro.reset_pwm_values()
+            present(m0)
 
             # --- Ожидаем ответ ------------------------------------
-            self._answer = None
+            # Запрос ответа уходит в GUI до сброса моторов: отрисовка
+            # подсказки идёт параллельно с записью в порт
+            with QMutexLocker(self._mutex):
+                self._answer = None
             self.awaitingAnswer.emit()
+            reset_pwm()
+            self._mutex.lock()
             while self._answer is None and not self._stop:
-                self.msleep(50)
+                self._cond.wait(self._mutex)
+            self._mutex.unlock()
 
             if self._stop or self._answer is None:
                 break
 
-            answers.append((true_region, self._answer))
+            answers[idx, 1] = self._answer
+            n_done = idx + 1
 
             # Пауза после ответа перед следующим шагом
-            time.sleep(0.5)
+            self._interruptible_sleep(500)
 
         # ------------------------------------------------------------------
         # Подведение итогов
         # ------------------------------------------------------------------
         
         result = {
-            'answers': answers,
+            'answers': answers[:n_done],        # при досрочной остановке — только полученные
             'mode': self.mode,
         }
         self.finished.emit(result)
@@ -12,15 +12,16 @@ MOLs, Spatial и PM-PWM.
 но могут быть выбраны и вручную.
 """
 
+import os
+from functools import partial
 from pathlib import Path
 from PyQt6.QtWidgets import (
     QDialog, QLineEdit, QPushButton,
     QFileDialog, QFormLayout, QHBoxLayout, QVBoxLayout
 )
 
-from PyQt6.QtGui import QPainter, QLinearGradient, QColor
-
 from core.paths import sanitize, test_folder
+from gui.background import set_gradient_background
 
 # Расширения файлов результатов для каждого теста
 EXTENSION = {
@@ -32,20 +33,27 @@ EXTENSION = {
 class AnalysisDialog(QDialog):
     """Окно выбора параметров анализа результатов тестов."""
 
-    def __init__(self, surname_default: str, style_fn, parent=None):
+    def __init__(self, surname_default: str, card_qss: str, parent=None):
         """
         Параметры
         ---------
         surname_default : str
             Фамилия по умолчанию, подставляемая в поле ввода.
-        style_fn : Callable
-            Функция для применения общего стиля приложения к виджетам.
+        card_qss : str
+            Таблица стилей приложения для виджетов с objectName="card"
+            (``MainWindow._START_QSS``); ставится один раз на весь диалог.
         parent : QWidget | None
             Родительский виджет.
         """
         super().__init__(parent)
         self.setWindowTitle("Параметры анализа")
 
+        # Градиентный фон заливает сам Qt по палитре; кисть ставит resizeEvent
+        self.setAutoFillBackground(True)
+
+        # Фамилия, для которой списки файлов уже заполнены
+        self._last_sn = None
+
         # Поле ввода фамилии
         self.editSurname = QLineEdit(surname_default)
 
@@ -54,6 +62,11 @@ class AnalysisDialog(QDialog):
         self.pathSpatial = QLineEdit(); self.pathSpatial.setReadOnly(True)
         self.pathPmpwm   = QLineEdit(); self.pathPmpwm.setReadOnly(True)
 
+        # Тест → поле с путём к его файлу
+        self._targets = {"mols":    self.pathMols,
+                         "spatial": self.pathSpatial,
+                         "pmpwm":   self.pathPmpwm}
+
         # Кнопки выбора файлов
         btnM, btnS, btnP = (QPushButton("…") for _ in range(3))
 
@@ -61,16 +74,15 @@ class AnalysisDialog(QDialog):
         ok = QPushButton("Начать анализ"); ok.clicked.connect(self.accept)
         cancel = QPushButton("Отмена");    cancel.clicked.connect(self.reject)
         
-        # Применяем стиль ко всем виджетам
-        # Функция, которую MainWindow использует, чтобы «красить» виджеты
-        self._apply_style = style_fn
-
-        # Применяем общмй стиль приложения ко всем виджетам
+        # Общий стиль приложения: виджеты помечаются objectName="card",
+        # а таблица ставится один раз на диалог (селектор #card не задевает
+        # дочерний QFileDialog)
         for w in (self.editSurname,
                   self.pathMols, self.pathSpatial, self.pathPmpwm,
                   btnM, btnS, btnP,
                   ok, cancel):
-            self._apply_style(w)
+            w.setObjectName("card")
+        self.setStyleSheet(card_qss)
 
         # Макет с полями и кнопками выбора
         form = QFormLayout()
@@ -87,7 +99,7 @@ class AnalysisDialog(QDialog):
         # Сигналы
         self.editSurname.editingFinished.connect(self._refresh_lists)
         for btn, test in ((btnM,"mols"), (btnS,"spatial"), (btnP,"pmpwm")):
-            btn.clicked.connect(lambda _,c=test: self._pick_file(c))
+            btn.clicked.connect(partial(self._pick_file, test, self._targets[test]))
         
         # Первичная подгрузка файлов
         self._refresh_lists()
@@ -101,18 +113,28 @@ class AnalysisDialog(QDialog):
     # ------------------------------------------------------------------ #
 
     def _refresh_lists(self):
+        # editingFinished приходит и при простой потере фокуса —
+        # без смены фамилии каталоги заново не сканируем
         sn = sanitize(self.editSurname.text())
+        if sn == self._last_sn:
+            return
+        self._last_sn = sn
 
         def fill(line: QLineEdit, test: str):
-            pattern = f"{test}_*{EXTENSION[test]}"
-            latest  = next(
-                iter(sorted(test_folder(sn, test).glob(pattern),
-                            reverse=True)),
-                None
-            )
+            # Один проход scandir без сортировки: последний запуск — это
+            # максимальное имя (в имени метка времени YYYY-MM-DDThh-mm-ss)
+            folder      = test_folder(sn, test)
+            prefix, ext = f"{test}_", EXTENSION[test]
+            try:
+                with os.scandir(folder) as it:
+                    latest = max((e.name for e in it
+                                  if e.name.startswith(prefix) and e.name.endswith(ext)),
+                                 default=None)
+            except OSError:             # каталог удалён во время сеанса — файлов нет
+                latest = None
             if latest:
-                line.setText(latest.name)
-                line.setProperty("fullPath", str(latest))
+                line.setText(latest)
+                line.setProperty("fullPath", str(folder / latest))
             else:
                 line.setText("— нет файлов —")
                 line.setProperty("fullPath", "")
@@ -121,7 +143,7 @@ class AnalysisDialog(QDialog):
         fill(self.pathSpatial, "spatial")
         fill(self.pathPmpwm,   "pmpwm")
 
-    def _pick_file(self, test):
+    def _pick_file(self, test: str, line: QLineEdit, _checked: bool = False):
         """Открывает диалог выбора файла результата для указанного теста."""
         start_dir = test_folder(sanitize(self.editSurname.text()), test)
         extension = EXTENSION[test]
@@ -133,9 +155,6 @@ class AnalysisDialog(QDialog):
             filter_str
         )
         if fn:
-            line = {"mols": self.pathMols,
-                    "spatial": self.pathSpatial,
-                    "pmpwm": self.pathPmpwm}[test]
             line.setText(Path(fn).name)
             line.setProperty("fullPath", fn)
 
@@ -160,10 +179,7 @@ class AnalysisDialog(QDialog):
     # Переопределённые методы
     # ------------------------------------------------------------------ #
    
-    def paintEvent(self, _):
-        """Рисует градиентный фон, как в главном окне приложения."""
-        painter = QPainter(self)
-        grad = QLinearGradient(0, 0, 0, self.height())
-        grad.setColorAt(0.0, QColor("#2ECC71"))
-        grad.setColorAt(1.0, QColor("#1ABC9C"))
-        painter.fillRect(self.rect(), grad)
\ No newline at end of file
+    def resizeEvent(self, event):
+        """Растягивает градиент фона (как в главном окне) на новую высоту."""
+        set_gradient_background(self)
+        super().resizeEvent(event)
\ No newline at end of file
@@ -0,0 +1,30 @@
+# gui/background.py
+
+"""
+Общий градиентный фон окон (сверху-зелёный, снизу-бирюзовый).
+
+Градиент ставится кистью палитры — фон заливает сам Qt, собственный
+``paintEvent`` окнам не нужен.
+"""
+
+from PyQt6.QtGui import QBrush, QColor, QLinearGradient, QPalette
+from PyQt6.QtWidgets import QWidget
+
+# Цвета градиентного фона
+BG_TOP    = QColor(0x2E, 0xCC, 0x71)      # #2ECC71
+BG_BOTTOM = QColor(0x1A, 0xBC, 0x9C)      # #1ABC9C
+
+
+def set_gradient_background(widget: QWidget):
+    """
+    Ставит градиент кистью роли ``Window`` в палитре ``widget``.
+    Вызывается при каждом изменении размера — градиент растягивается
+    на высоту окна. У окна должен быть включён ``autoFillBackground``.
+    """
+    grad = QLinearGradient(0, 0, 0, widget.height())
+    grad.setColorAt(0.0, BG_TOP)
+    grad.setColorAt(1.0, BG_BOTTOM)
+
+    pal = widget.palette()
+    pal.setBrush(QPalette.ColorRole.Window, QBrush(grad))
+    widget.setPalette(pal)
@@ -0,0 +1,22 @@
+# gui/fonts.py
+
+"""
+Общие шрифты окон.
+
+Шрифт нужного кегля создаётся один раз на процесс (после создания
+``QApplication``) и переиспользуется всеми виджетами — вместо разбора
+строки ``font-size`` в ``setStyleSheet`` у каждого виджета.
+"""
+
+from functools import cache
+
+from PyQt6.QtGui import QFont
+from PyQt6.QtWidgets import QApplication
+
+
+@cache
+def app_font(point_size: int) -> QFont:
+    """Шрифт приложения с кеглем ``point_size`` pt."""
+    font = QFont(QApplication.font())
+    font.setPointSize(point_size)
+    return font
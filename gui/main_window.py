@@ -11,23 +11,21 @@
 - обработка всех основных сигналов и переходов между окнами.
 """
 
-import json
 import numpy as np
+from functools import cache, partial
 from pathlib import Path
 
-from PyQt6.QtCore import Qt, QTimer, QRect
-from PyQt6.QtGui import (
-    QKeySequence, QShortcut, QPainter, QLinearGradient,
-    QColor
-)
+from PyQt6.QtCore import Qt, QThreadPool
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QLabel, QLineEdit,
     QPushButton, QVBoxLayout, QMessageBox, QDialog
 )
 
 from core.config import default_hyps
-from core.paths  import build_file_base
+from core.json_utils import dump_json
+from core.paths  import build_file_base, missing_files
 from core.serial_api import VibroBox
+from core.save_runner import SaveRunner, SaveSignals
 
 from core.mols_test import MolsWorker
 from gui.mols_probe_window import MOLsProbeWindow
@@ -42,13 +40,48 @@ from gui.pmpwm_probe_window import PMPWMProbeWindow
 from gui.pmpwm_hyperparams_dialog import PMPWMHyperparamsDialog
 
 from gui.analysis_dialog import AnalysisDialog
+from gui.background import set_gradient_background
 from core.report_utils import generate_summary 
 
 
+@cache
+def _figure_cls():
+    """
+    Класс ``matplotlib.figure.Figure``. Импорт matplotlib (~0.3 с) отложен
+    до первого вызова и выполняется один раз.
+    """
+    from matplotlib.figure import Figure
+    return Figure
+
+
 class MainWindow(QMainWindow):
     """
     Главное окно приложения: стартовое меню, подключение, запуск тестов.
     """
+
+    # Единый стиль кнопок и полей ввода (строки разбираются Qt один раз
+    # на виджет‑контейнер, а не на каждый дочерний виджет)
+    _WIDGET_STYLE = """
+        background-color: rgba(255,255,255,0.9);
+        border: none;
+        border-radius: 12px;
+        padding: 8px;
+        font-size: 12pt;
+        color: #333;
+    """
+    _START_QSS = "QPushButton#card, QLineEdit#card {" + _WIDGET_STYLE + "}"
+
+    # Стиль метки статуса подключения: «нет» / «есть»
+    _STATUS_QSS = """
+        background-color: rgba(255,255,255,0.3);
+        border-radius: 8px;
+        padding: 4px 12px;
+        font-size: 11pt;
+        color: %s;
+    """
+    _STATUS_OFF_QSS = _STATUS_QSS % "#e74c3c"
+    _STATUS_ON_QSS  = _STATUS_QSS % "#27ae60"
+
     def __init__(self):
         super().__init__()
         self.resize(600, 400)
@@ -59,46 +92,99 @@ class MainWindow(QMainWindow):
         self.worker = None                  # Текущий фоновый поток выполняемого теста. Между тестами равен None.
         self.current_surname: str = ""      # Текущая фамилия пациента; сохраняется между тестами в пределах сессии.
 
+        # --- Состояние PM-PWM (используется при перезаписывании данных) ---
+        self._pending_queue:    list[int] = []      # Очередь моторов к дозапуску
+        self.motors_all:        list[int] = []      # Полный список моторов
+        self.motors_completed:  set[int]  = set()   # Завершённые моторы
+        self._motors_total:     int       = 0       # len(motors_all), для проверки «все готовы»
+        self.results_pmpwm: dict[int, np.ndarray] = {}  # (N, 2) int16: истина, ответ
+
+        # Градиентный фон заливает сам Qt по палитре; кисть ставит resizeEvent
+        self.setAutoFillBackground(True)
+
+        # Сигналы фоновых задач сохранения: держим ссылки до доставки итога
+        self._save_signals: set[SaveSignals] = set()
+
         self._build_start_ui()
 
+        # Прогреваем импорт matplotlib в пуле потоков, пока оператор
+        # заполняет форму, — к сохранению первого теста он уже готов
+        QThreadPool.globalInstance().start(_figure_cls)
+
     # =====================================================================
     #                       UI-ПОМОЩНИКИ
     # =====================================================================
     
-    def _apply_widget_style(self, w):
+    def _run_save(self, job, on_done, win=None):
         """
-        Применяет единый стиль для кнопок и полей ввода:
-        закруглённый белый фон с небольшим паддингом.
+        Выполняет запись файлов ``job()`` в ``QThreadPool``, не блокируя окно.
+        ``on_done(info)`` вызывается в GUI‑потоке, когда всё записано;
+        при ошибке окно теста ``win`` (если задано) закрывается.
         """
-        w.setStyleSheet("""
-            background-color: rgba(255,255,255,0.9);
-            border: none;
-            border-radius: 12px;
-            padding: 8px;
-            font-size: 12pt;
-            color: #333;
-        """ )
 
+        runner  = SaveRunner(job)
+        signals = runner.signals
+        self._save_signals.add(signals)
+
+        def _deliver(slot, arg):
+            self._save_signals.discard(signals)
+            slot(arg)
+
+        signals.done.connect(partial(_deliver, on_done))
+        signals.failed.connect(partial(_deliver, partial(self._on_save_failed, win)))
+        QThreadPool.globalInstance().start(runner)
+
+
+    def _after_indicator(self, slot):
+        """
+        Мигает индикатором начала теста, не блокируя окно, и вызывает
+        ``slot`` после мигания и паузы успокоения (сигнал ``indicatorDone``).
+        Если плата не ответила, ``begin_end_indicator_async`` сам отключает
+        ``slot`` — тест не стартует.
+        """
+        self.vibro.indicatorDone.connect(slot, Qt.ConnectionType.SingleShotConnection)
+        self.vibro.begin_end_indicator_async()
+
+
+    def _on_save_failed(self, win, message: str):
+        """
+        Ошибка фоновой записи: сообщаем, закрываем окно теста ``win``
+        и возвращаемся в главное меню.
+        """
+
+        QMessageBox.warning(self, "Ошибка сохранения", message)
+        if win is not None:
+            win.close()
+        self._show_start_ui()
+
+
+    @staticmethod
+    def _save_json(path: Path, data: dict) -> dict:
+        """Записывает ``data`` в JSON (вызывается вне GUI‑потока)."""
 
-    def paintEvent(self, event):
-        """Градиентный фон: сверху-зелёный, снизу-бирюзовый."""
-        painter = QPainter(self)
-        grad = QLinearGradient(0, 0, 0, self.height())
-        grad.setColorAt(0.0, QColor("#2ECC71"))
-        grad.setColorAt(1.0, QColor("#1ABC9C"))
-        painter.fillRect(QRect(0, 0, self.width(), self.height()), grad)
+        dump_json(data, path)
+        return {"json": path}
+
+
+    @staticmethod
+    def _save_npy(path: Path, arr: np.ndarray) -> dict:
+        """Записывает массив в NPY, создав папку (вызывается вне GUI‑потока)."""
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.save(path, arr)
+        return {"npy": path}
+
+
+    def resizeEvent(self, event):
+        """Растягивает градиент фона на новую высоту окна."""
+        set_gradient_background(self)
+        super().resizeEvent(event)
 
 
     def _set_connected_ui(self) -> None:
         """Отображает статус «Подключено» и разблокирует кнопки тестов."""
         self.lbl_status.setText('✔️ Подключено')
-        self.lbl_status.setStyleSheet("""
-            background-color: rgba(255,255,255,0.3);
-            border-radius: 8px;
-            padding: 4px 12px;
-            font-size: 11pt;
-            color: #27ae60;
-        """)
+        self.lbl_status.setStyleSheet(self._STATUS_ON_QSS)
 
         for b in (self.btn_start, self.btn_spatial, self.btn_pmpwm):
             b.setEnabled(True)
@@ -108,10 +194,17 @@ class MainWindow(QMainWindow):
     # =====================================================================
 
     def _build_start_ui(self):
-        """Создаёт стартовое окно с кнопками запуска тестов."""
+        """
+        Создаёт стартовое окно с кнопками запуска тестов.
+
+        Вызывается один раз из ``__init__``; возврат в меню после тестов —
+        через :meth:`_show_start_ui`, без пересоздания виджетов.
+        """
         
-        # Создаём контейнер для элементов
+        # Создаём контейнер для элементов; стиль «карточек» задаётся
+        # один раз на контейнер и применяется к детям по objectName
         w = QWidget()
+        w.setStyleSheet(self._START_QSS)
         self.setCentralWidget(w)
 
         # Поле ввода фамилии
@@ -122,47 +215,41 @@ class MainWindow(QMainWindow):
             lambda: setattr(self, "current_surname",
                             self.le_name.text().strip()))
         self.le_name.setMaximumWidth(400)
-        self._apply_widget_style(self.le_name)
+        self.le_name.setObjectName('card')
 
         # Кнопка "Подключиться"
         self.btn_connect = QPushButton('Подключиться')
         self.btn_connect.setMaximumWidth(400)
-        self._apply_widget_style(self.btn_connect)
+        self.btn_connect.setObjectName('card')
 
         # Кнопка "Начать MOLs-тест тест"
         self.btn_start = QPushButton('Начать MOLs-тест')
         self.btn_start.setMaximumWidth(400)
         self.btn_start.setEnabled(False)
-        self._apply_widget_style(self.btn_start)
+        self.btn_start.setObjectName('card')
 
         # Кнопка "Начать Spatial-тест"
         self.btn_spatial = QPushButton('Начать Spatial-тест')
         self.btn_spatial.setMaximumWidth(400)
         self.btn_spatial.setEnabled(False)
-        self._apply_widget_style(self.btn_spatial)
+        self.btn_spatial.setObjectName('card')
 
         # Кнопка "Начать PM-PWM-тест"
         self.btn_pmpwm = QPushButton('Начать PM-PWM-тест')
         self.btn_pmpwm.setMaximumWidth(400)
         self.btn_pmpwm.setEnabled(False)
-        self._apply_widget_style(self.btn_pmpwm)
+        self.btn_pmpwm.setObjectName('card')
 
         # Кнопка "Провести анализ" 
         self.btn_analyze = QPushButton('Провести анализ')
         self.btn_analyze.setMaximumWidth(400)
-        self._apply_widget_style(self.btn_analyze)
+        self.btn_analyze.setObjectName('card')
         
         # Статус подключения
         self.lbl_status = QLabel('❌ Не подключено')
         self.lbl_status.setMaximumWidth(200)
         self.lbl_status.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.lbl_status.setStyleSheet("""
-            background-color: rgba(255,255,255,0.3);
-            border-radius: 8px;
-            padding: 4px 12px;
-            font-size: 11pt;
-            color: #e74c3c;
-        """)
+        self.lbl_status.setStyleSheet(self._STATUS_OFF_QSS)
 
         # Layout: центральные виджеты по центру, статус ниже
         layout = QVBoxLayout(w)
@@ -191,6 +278,14 @@ class MainWindow(QMainWindow):
         if self.vibro.ser and self.vibro.ser.is_open:
             self._set_connected_ui()
 
+
+    def _show_start_ui(self):
+        """Возвращает главное меню: обновляет фамилию/статус и показывает окно."""
+        self.le_name.setText(self.current_surname)
+        if self.vibro.ser and self.vibro.ser.is_open:
+            self._set_connected_ui()
+        self.show()
+
     # =====================================================================
     #                         ПОДКЛЮЧЕНИЕ
     # =====================================================================
@@ -226,10 +321,7 @@ class MainWindow(QMainWindow):
         
         # 1) Собираем базовые гиперпараметры по фамилии
         surname = self.current_surname or 'anon'
-        
-        # Импортируем здесь, чтобы не загружать модуль раньше времени
-        import core.config
-        self.hyps = core.config.default_hyps(surname)
+        self.hyps = default_hyps(surname)
 
         # 2) Показываем диалог редактирования гиперпараметров
         dlg = MOLsHyperparamsDialog(self.hyps, parent=self)
@@ -238,16 +330,13 @@ class MainWindow(QMainWindow):
         # Обновляем self.hyps новыми значениями
         self.hyps = dlg.get_hyps()
 
-        # 3) Мигаем индикатором начала
-        self.vibro.begin_end_indicator()
-
-        # 4) Через 1.5 с запускаем остальную логику теста
-        QTimer.singleShot(1500, self._start_test_after_delay)
+        # 3) Мигаем индикатором начала; по его окончании запускаем тест
+        self._after_indicator(self._start_test_after_delay)
 
     def _start_test_after_delay(self):
         """
         Создаёт поток MOLs, окно опроса и соединяет все сигналы.
-        Запускает тест и назначает горячие клавиши «да/нет».
+        Запускает тест.
         """
 
         # 1) Берём уже отредактированные гиперпараметры
@@ -266,30 +355,17 @@ class MainWindow(QMainWindow):
         self.probe_win.worker = self.worker     # Окно может слать ответы в поток
 
         # 4) Подключаем сигналы
-        self.worker.progress.connect(
-            lambda m, done, total, mode: self.probe_win.update_status(m, done, mode)
-        )
-        self.worker.vibrationStarted.connect(
-            lambda: self.probe_win.ProcessLabel.setText('ВИБРАЦИЯ')
-        )
-        self.worker.awaitingAnswer.connect(
-            lambda: self.probe_win.ProcessLabel.setText('Почувствовали?')
-        )
-        self.worker.finished.connect(lambda res: self._on_finished(res, hyps))
+        self.worker.progress.connect(self.probe_win.update_status)
+        self.worker.stateChanged.connect(self.probe_win.set_state)
+        self.worker.finished.connect(partial(self._on_finished, hyps=hyps))
 
         # 5) Показываем окно теста и скрываем главное
         self.probe_win.show()
         self.hide()
 
-        # 6) Запускаем тест
+        # 6) Запускаем тест (горячие клавиши «да/нет» создаёт само окно)
         self.worker.start()
 
-        # 7) Глобальные шорткаты
-        QShortcut(QKeySequence(Qt.Key.Key_Left),  self.probe_win,
-                  activated=lambda: self.worker.set_answer('y'))
-        QShortcut(QKeySequence(Qt.Key.Key_Right), self.probe_win,
-                  activated=lambda: self.worker.set_answer('n'))
-
 
     def _on_finished(self, results: dict, hyps: dict):
         """Завершение MOLs‑теста: сохранение JSON и возврат в главное меню."""
@@ -298,18 +374,26 @@ class MainWindow(QMainWindow):
 
         json_path = base.parent / f"{base.name}_results.json"
 
-        with open(json_path, "w", encoding="utf8") as f:
-            json.dump(results, f, ensure_ascii=False, indent=2)
+        # Пока JSON пишется, окно опроса неактивно («Домой» и стрелки не
+        # работают); закрывает именно это окно _mols_saved / _on_save_failed
+        win = self.probe_win
+        win.setEnabled(False)
+
+        self._run_save(partial(self._save_json, json_path, results),
+                       partial(self._mols_saved, win), win)
+
+
+    def _mols_saved(self, win, info: dict):
+        """JSON MOLs записан: сообщение и возврат в главное меню."""
 
         QMessageBox.information(
             self, "MOLs-тест завершён",
-            f"Результаты сохранены в\n{json_path}"
+            f"Результаты сохранены в\n{info['json']}"
         )
 
         # Закрываем окно теста и возвращаем главное
-        self.probe_win.close()
-        self.show()
-        self._build_start_ui()
+        win.close()
+        self._show_start_ui()
 
     # ==================================================================
     #                           SPATIAL-ТЕСТ
@@ -329,8 +413,7 @@ class MainWindow(QMainWindow):
         self.hyps = dlg.get_hyps()
 
         # 3) Индикатор начала, как для MOLs-теста
-        self.vibro.begin_end_indicator()
-        QTimer.singleShot(1500, self._start_spatial_after_delay)
+        self._after_indicator(self._start_spatial_after_delay)
 
 
     def _start_spatial_after_delay(self):
@@ -349,7 +432,7 @@ class MainWindow(QMainWindow):
         # 3) Открываем окно вопросов
         total_motors = hyps['num_motor_end'] - hyps['num_motor_start'] + 1      # Считаем число моторов включительно:
         n_pairs = total_motors // hyps['use_motors_step']                       # И только потом делим на шаг
-        self.probe_win = SpatialProbeWindow(n_pairs, self._apply_widget_style, parent=self)
+        self.probe_win = SpatialProbeWindow(n_pairs, parent=self)
         self.probe_win.show()
 
         # Закрываем главное окно
@@ -376,21 +459,23 @@ class MainWindow(QMainWindow):
         base   = build_file_base(self.current_surname, "spatial") 
         npy_path  = base.parent / f"{base.name}_results.npy"
 
-        # 3) Подготавливаем массив ответов
-        answers = np.array(result['answers'], dtype=int)
+        # 3) Массив ответов (N, 2) int16 приходит из воркера готовым — без копии
+        answers = np.asarray(result['answers'], dtype=np.int16)
 
-        # 4) Убедимся, что папка существует и сохраняем
-        npy_path.parent.mkdir(parents=True, exist_ok=True)
-        np.save(npy_path, answers)
+        # 4) Сохраняем в фоне; сообщение покажем по готовности
+        self._run_save(partial(self._save_npy, npy_path, answers),
+                       self._spatial_saved)
+
+
+    def _spatial_saved(self, info: dict):
+        """NPY Spatial записан: сообщение и возврат в главное меню."""
 
-        # 5) Показываем пользователю сообщение и возвращаем UI
         QMessageBox.information(
             self,
             'Spatial-тест завершён',
-            f"Результаты сохранены в файле:\n{npy_path}"
+            f"Результаты сохранены в файле:\n{info['npy']}"
         )
-        self._build_start_ui()
-        self.show()
+        self._show_start_ui()
     
 
     # ==================================================================
@@ -412,15 +497,7 @@ class MainWindow(QMainWindow):
             return
         self.hyps = dlg.get_hyps()
 
-        self.vibro.begin_end_indicator()
-        QTimer.singleShot(1500, self._start_pmpwm_after_delay)
-
-
-    # Переменные, которые используются при перезаписывании данных
-    _pending_queue:     list[int] = []      # Очередь моторов к дозапуску
-    motors_all:         list[int] = []      # Полный список моторов
-    motors_completed:   set[int]  = set()   # Завершённые моторы
-    results_pmpwm:      dict[int, list[tuple[int,int]]] = {}
+        self._after_indicator(self._start_pmpwm_after_delay)
 
 
     def drop_partial_pmpwm_data(self, motor_idx: int):
@@ -432,28 +509,29 @@ class MainWindow(QMainWindow):
         чтобы переписать их заново.
         """
 
-        if hasattr(self, "results_pmpwm"):
-            self.results_pmpwm.pop(motor_idx, None)
+        self.results_pmpwm.pop(motor_idx, None)
 
 
     def _launch_pmpwm_worker(self, motors_list: list[int]):
         """
-        Запускает новый поток PM-PWM-теста.
-        
-        Если старый воркер ещё жив (теоретически), аккуратно останавливает его.
+        Запускает поток PM-PWM-теста для очереди моторов.
+
+        Если в текущей сессии уже есть отработавший воркер, он перезапускается
+        (без создания нового QThread и повторного подключения сигналов).
         """
 
+        # 0)  переиспользуем остановленный воркер этой же сессии
+        w = self.worker
+        if isinstance(w, PMPWMWorker) and w.hyps is self.hyps and w.isFinished():
+            w.restart(motors_list)
+            return
+
         # 1)  создаём новый воркер с нужной очередью моторов
         h = self.hyps
         self.worker = PMPWMWorker(self.vibro, h, motors_list)
 
         # 2)  (пере-)подключаем сигналы к текущему probe-окну
-        self.worker.progress.connect(
-            lambda m, d, t: self.probe_win.update_status(m, d, t)
-        )
-        self.worker.awaitingAnswer.connect(
-            lambda: self.probe_win.lbl_prompt.setText("Какой уровень?")
-        )
+        self.worker.progress.connect(self.probe_win.update_status)
         self.worker.motorFinished.connect(self._on_motor_done)
         self.worker.finished.connect(self._on_partial_finished)
 
@@ -469,15 +547,14 @@ class MainWindow(QMainWindow):
         ))
 
         self.motors_all       = motors             # Список всех моторов
+        self._motors_total    = len(motors)
         self.motors_completed = set()              # Какие уже готовы
-        self.results_pmpwm    = {}                 # {motor: [...]}
+        self.results_pmpwm    = {}                 # {motor: ndarray (N, 2)}
         self._pending_queue   = []                 # Список моторов, которые ждут запуска
 
         # Создаём окно опроса и показываем
         n_levels = len(h['pmpwm_pwm_values'])
-        self.probe_win = PMPWMProbeWindow(
-            n_levels, self._apply_widget_style, parent=self
-        )
+        self.probe_win = PMPWMProbeWindow(n_levels, parent=self)
 
         self.probe_win.show()
         self.hide()
@@ -492,10 +569,11 @@ class MainWindow(QMainWindow):
         и проверяем, все ли моторы уже готовы.
         """
         self.motors_completed.add(motor)
-        # Копируем свежие ответы
-        self.results_pmpwm[motor] = self.worker.results[motor]
+        # Копируем свежие ответы: массив (N, 2) — столбцы «истина, ответ»
+        self.results_pmpwm[motor] = self.worker.results[motor].astype(np.int16)
 
-        if self.motors_completed == set(self.motors_all):
+        # motors_completed ⊆ motors_all, поэтому хватает сравнить размеры
+        if len(self.motors_completed) == self._motors_total:
             self.probe_win.show_finish()    # Кнопка «Завершить тест»
 
 
@@ -514,48 +592,51 @@ class MainWindow(QMainWindow):
     def _finish_pmpwm(self):
         """Финализация PM‑PWM: агрегация метрик, построение матриц ошибок."""
         
-        # 1) Собираем общий список ответов
-        all_ans = sum(self.results_pmpwm.values(), [])
+        pwm_vals = self.hyps["pmpwm_pwm_values"]
+        levels   = len(pwm_vals)
+
+        def _confusion(arr: np.ndarray) -> np.ndarray:
+            """Матрица ошибок из массива пар (истина, ответ), индексы с 0."""
+            flat = arr[:, 0] * levels + arr[:, 1]
+            return np.bincount(flat, minlength=levels * levels).reshape(levels, levels)
+
+        # 1) Массивы ответов по моторам (индексы уровней с 0)
+        arr_per_motor: dict[int, np.ndarray] = {
+            m: pairs - 1 for m, pairs in self.results_pmpwm.items()
+        }
 
         # 2) Точность по каждому мотору
         per_motor_acc: dict[int, float] = {}
         for m in self.motors_all:
-            local = self.results_pmpwm.get(m, [])
-            if not local:
+            arr = arr_per_motor.get(m)
+            if arr is None or not len(arr):
                 per_motor_acc[m] = 0.0
                 continue
-            ok = sum(t == p for t, p in local)
-            per_motor_acc[m] = ok / len(local)
+            per_motor_acc[m] = float((arr[:, 0] == arr[:, 1]).mean())
 
         mean_acc = np.mean(list(per_motor_acc.values())) if per_motor_acc else 0.0
 
-        # 3) Локальные confusion‑матрицы по моторам
-        pwm_vals = self.hyps["pmpwm_pwm_values"]
-        levels   = len(pwm_vals)
-        conf_per_motor: dict[int, np.ndarray] = {}
-        for m, pairs in self.results_pmpwm.items():
-            cm_local = np.zeros((levels, levels), dtype=int)
-            for t, p in pairs:
-                cm_local[t-1, p-1] += 1
-            conf_per_motor[m] = cm_local
+        # 3) Локальные confusion‑матрицы по моторам: стопка (M, L, L)
+        #    переводится в списки для JSON одним вызовом tolist()
+        cm_stack = np.array(
+            [_confusion(arr) for arr in arr_per_motor.values()]
+        ).reshape(-1, levels, levels)
+        conf_per_motor: dict[int, list] = dict(zip(arr_per_motor, cm_stack.tolist()))
 
         # 4) Общая confusion‑matrix
-        pwm_vals = self.hyps["pmpwm_pwm_values"]
-        levels   = len(pwm_vals)
-        cm = np.zeros((levels, levels), dtype=int)
-        for t, p in all_ans:
-            cm[t-1, p-1] += 1
+        all_arr = np.concatenate([np.empty((0, 2), dtype=np.int16),
+                                  *arr_per_motor.values()])
+        cm = _confusion(all_arr)
 
-        # 5) Формируем словарь результатов
+        # 5) Формируем словарь результатов (в JSON — обычные списки)
         res = {
-            "answers": all_ans,
+            "answers": (all_arr + 1).tolist(),
             "per_motor_accuracy": per_motor_acc,
             "mean_accuracy": mean_acc,
             "confusion": cm.tolist(),
             "pwm_values": pwm_vals,
             "repeats": self.hyps["pmpwm_repeats"],
-            "confusion_per_motor": {m: cm.tolist()
-                        for m, cm in conf_per_motor.items()},
+            "confusion_per_motor": conf_per_motor,
         }
         self._pmpwm_finished(res)
 
@@ -568,24 +649,35 @@ class MainWindow(QMainWindow):
             self.worker.stop()
             self.worker.wait(1000)
 
-        # 2) Удаляем старые данные мотора, чтобы переписать с нуля
+        # 2) Удаляем старые данные мотора, чтобы переписать с нуля, и
+        # 3) формируем pending-очередь = (все ещё не завершённые, кроме выбранного)
+        self._pending_queue = self._reopen_motor(motor)
+
+        # 4) Запускаем воркер только на выбранный мотор
+        self._launch_pmpwm_worker([motor])
+
+
+    def _reopen_motor(self, motor: int) -> list[int]:
+        """
+        Помечает мотор незавершённым и стирает его ответы. Возвращает
+        остальные незавершённые моторы в порядке `motors_all`.
+        """
         self.motors_completed.discard(motor)
         self.results_pmpwm.pop(motor, None)
+        return self._pending_after(motor)
 
-        # 3) Формируем pending-очередь = (все ещё не завершённые, кроме выбранного)
-        rest = [m for m in self.motors_all
-                if m not in self.motors_completed and m != motor]
-        self._pending_queue = rest
 
-        # 4) Запускаем воркер только на выбранный мотор
-        self._launch_pmpwm_worker([motor])
+    def _pending_after(self, motor: int) -> list[int]:
+        """Незавершённые моторы, кроме `motor`, в порядке `motors_all`."""
+        excluded = self.motors_completed | {motor}
+        return [m for m in self.motors_all if m not in excluded]
 
 
     def _pmpwm_finished(self, res: dict):
         """
         Сохранение результатов PM‑PWM и информирование пользователя.
 
-        Сохраняем:
+        Сохраняем (в пуле потоков, см. :meth:`_save_pmpwm_files`):
         • NPY с парами (true_level, predicted_level);
         • JSON с метриками и confusion-matrix;
         • PNG общей и помоторных confusion-matrix;
@@ -593,121 +685,157 @@ class MainWindow(QMainWindow):
         """
 
         # 1) Определяем дериктории
-        base   = build_file_base(self.current_surname, "pmpwm")
+        base = build_file_base(self.current_surname, "pmpwm")
+
+        # 2) Пока файлы пишутся, окно опроса неактивно: повторное «Завершить»,
+        #    «Переписать» или «Стоп» не должны вмешаться в сохранение.
+        #    Закрывает именно это окно _pmpwm_saved / _on_save_failed
+        win = self.probe_win
+        win.setEnabled(False)
+
+        # 3) Пишем файлы в фоне; сообщение покажем по готовности
+        job = partial(self._save_pmpwm_files, base, res,
+                      dict(self.results_pmpwm), self.hyps["pmpwm_pwm_values"])
+        self._run_save(job, partial(self._pmpwm_saved, win, res), win)
+
+
+    @classmethod
+    def _save_pmpwm_files(cls, base: Path, res: dict,
+                          pairs_per_motor: dict, pwm_vals: list) -> dict:
+        """
+        Записывает NPY, JSON и PNG результатов PM‑PWM. Выполняется вне
+        GUI‑потока, поэтому рисует через ``matplotlib.figure.Figure``
+        без pyplot.
+        """
+
         json_path = base.parent / f"{base.name}_results.json"
         npy_path  = base.parent / f"{base.name}_results.npy"
         png_path  = base.parent / f"{base.name}_conf.png"
 
-        # 2) Сохраняем NPY
+        # 1) Сохраняем NPY
         np.save(npy_path, np.array(res["answers"], dtype=int))
 
-        # 3) Сохраняем JSON
+        # 2) Сохраняем JSON
         try:
-            with open(json_path, "w", encoding="utf8") as f:
-                json.dump(res, f, ensure_ascii=False, indent=2)
+            dump_json(res, json_path)
         except Exception as e:
             json_path = f"Ошибка сохранения JSON: {e}"
 
-        # 4a) PNG общей confusion-matrix
+        '''
+        Деления осей общие для всех графиков: в CM оценки подписаны 1-5,
+        а не 0-4, на scatter — уровни 1-5
+        '''
+        levels = len(pwm_vals)
+        ticks  = np.arange(levels)
+        labels = [str(i) for i in range(1, levels+1)]
+        level_ticks = ticks + 1
+
+        # 3) Фигуры переиспользуются для всех PNG: холст и шрифты создаются
+        #    один раз, а не на каждый мотор. Если их не создать — NPY и JSON
+        #    уже записаны, сообщаем о них и об отсутствии PNG
         try:
-            import matplotlib.pyplot as plt
-
-            cm = np.array(res["confusion"])
-            plt.figure(figsize=(4, 4))
-            plt.imshow(cm, cmap="Blues")
-
-            '''
-            Шесть нижних строчек кода нужны для того,
-            чтоб в CM нормально прописывались оценки 1-5, а не 0-4
-            '''
-            pwm_vals = self.hyps["pmpwm_pwm_values"]
-            levels   = len(pwm_vals)
-            ticks  = np.arange(levels)
-            labels = [str(i) for i in range(1, levels+1)]
-            plt.xticks(ticks, labels)
-            plt.yticks(ticks, labels)
-
-            plt.colorbar()
-            for (i, j), val in np.ndenumerate(cm):
-                plt.text(j, i, str(val), ha="center", va="center", color="black")
-            plt.xlabel("Предсказано")
-            plt.ylabel("Истина")
-            plt.tight_layout()
-            plt.savefig(png_path, dpi=150)
-            plt.close()
+            Figure = _figure_cls()
+            fig_cm = Figure(figsize=(4, 4))
+            fig_sc = Figure(figsize=(5, 3))
+        except Exception as e:
+            return {"json": json_path, "npy": npy_path,
+                    "png": [f"PNG-не сохранены ({e})"]}
+
+        # 3a) PNG общей confusion-matrix
+        try:
+            cls._save_confusion_png(fig_cm, res["confusion"], png_path, ticks, labels)
         except Exception as e:
             png_path = f"PNG-не сохранён ({e})"
         
-        # 4b) PNG confusion-matrix по каждому мотору
+        # 3b) PNG confusion-matrix по каждому мотору
         png_paths_motors = []
         for m, cm_local in res.get("confusion_per_motor", {}).items():
             png_m = base.parent / f"{base.name}_motor{m}_conf.png"
-            plt.figure(figsize=(4, 4))
-            plt.imshow(np.array(cm_local), cmap="Blues")
-
-            plt.title(f"Мотор {m}", fontsize=14, pad=8)
-
-            '''
-            Шесть нижних строчек кода нужны для того,
-            чтоб в CM нормально прописывались оценки 1-5, а не 0-4
-            '''
-            pwm_vals = self.hyps["pmpwm_pwm_values"]
-            levels   = len(pwm_vals)
-            ticks  = np.arange(levels)
-            labels = [str(i) for i in range(1, levels+1)]
-            plt.xticks(ticks, labels)
-            plt.yticks(ticks, labels)
-
-            plt.colorbar()
-            for (i, j), val in np.ndenumerate(cm_local):
-                plt.text(j, i, str(val), ha="center", va="center", color="black")
-            plt.xlabel("Предсказано"); plt.ylabel("Истина")
-            plt.tight_layout(); plt.savefig(png_m, dpi=150); plt.close()
+            try:
+                cls._save_confusion_png(fig_cm, cm_local, png_m, ticks, labels,
+                                        title=f"Мотор {m}")
+            except Exception as e:
+                png_m = f"{png_m.name}: PNG-не сохранён ({e})"
             png_paths_motors.append(png_m)
 
-        # 4c) PNG scatter‑графика по каждому мотору
-        pwm_vals = self.hyps["pmpwm_pwm_values"]
+        # 3c) PNG scatter‑графика по каждому мотору
         png_paths_pm = []
 
-        for m, pairs in self.results_pmpwm.items():
-            if not pairs:
+        pwm_arr = np.asarray(pwm_vals)
+        for m, pairs in pairs_per_motor.items():
+            if not len(pairs):
                 continue
 
-            x_pwm   = [pwm_vals[t-1] for t, _ in pairs]     # Истинный PWM
-            y_stage = [p for _, p in pairs]                 # Предсказанный уровень
-
-            plt.figure(figsize=(5, 3))
-            plt.scatter(x_pwm, y_stage, marker='o')
-            plt.title(f'PM-PWM motor {m}')
-            plt.xlabel('PWM');  plt.ylabel('PM (уровень)')
-            plt.yticks(range(1, len(pwm_vals)+1))
-            plt.grid(True);  plt.tight_layout()
+            x_pwm   = pwm_arr[pairs[:, 0] - 1]              # Истинный PWM
+            y_stage = pairs[:, 1]                           # Предсказанный уровень
 
             png_sc = base.parent / f"{base.name}_motor{m}_pm_pwm.png"
-            plt.savefig(png_sc, dpi=150); plt.close()
+            try:
+                fig_sc.clear()
+                ax = fig_sc.add_subplot()
+                ax.scatter(x_pwm, y_stage, marker='o')
+                ax.set_title(f'PM-PWM motor {m}')
+                ax.set_xlabel('PWM');  ax.set_ylabel('PM (уровень)')
+                ax.set_yticks(level_ticks)
+                ax.grid(True);  fig_sc.tight_layout()
+                fig_sc.savefig(png_sc, dpi=150)
+            except Exception as e:
+                png_sc = f"{png_sc.name}: PNG-не сохранён ({e})"
             png_paths_pm.append(png_sc)
 
-        # 5) Сводка точности по моторам
+        return {"json": json_path, "npy": npy_path,
+                "png": [png_path, *png_paths_motors, *png_paths_pm]}
+
+
+    def _pmpwm_saved(self, win, res: dict, info: dict):
+        """Файлы PM‑PWM записаны: сводка пользователю и возврат в меню."""
+
+        # 1) Сводка точности по моторам
         per_lines = [
             f"Мотор {m}: {acc*100:.1f} %"
             for m, acc in sorted(res["per_motor_accuracy"].items())
         ]
         per_text = "\n".join(per_lines)
 
-        # 6) Сообщение пользователю
-        msg_png_list = "\n".join(str(p) for p in
-                         [png_path, *png_paths_motors, *png_paths_pm])
+        # 2) Сообщение пользователю
+        msg_png_list = "\n".join(str(p) for p in info["png"])
         QMessageBox.information(
             self,
             "PM-PWM-тест завершён",
             f"{per_text}\n─ Средняя: {res['mean_accuracy']*100:.1f} %\n\n"
-            f"JSON: {json_path}\nNPY : {npy_path}\nPNG : \n{msg_png_list}"
+            f"JSON: {info['json']}\nNPY : {info['npy']}\nPNG : \n{msg_png_list}"
         )
 
-        # 7) Возвращаемся на главный экран
-        self.probe_win.close()      # Закрыли окно опроса
-        self._build_start_ui()      # Пересоздали центральный виджет
-        self.show()                 # Снова делаем главное окно видимым
+        # 3) Возвращаемся на главный экран
+        win.close()                 # Закрыли окно опроса
+        self._show_start_ui()       # Главное меню снова видно
+
+
+    @staticmethod
+    def _save_confusion_png(fig, cm, path, ticks, labels: list[str],
+                            title: str | None = None):
+        """
+        Рисует confusion-matrix на переиспользуемой `fig` и сохраняет PNG.
+        ``ticks``/``labels`` — деления осей, считаются вызывающим один раз.
+        """
+
+        cm = np.asarray(cm)
+        fig.clear()
+        ax = fig.add_subplot()
+        im = ax.imshow(cm, cmap="Blues")
+        if title:
+            ax.set_title(title, fontsize=14, pad=8)
+
+        ax.set_xticks(ticks, labels)
+        ax.set_yticks(ticks, labels)
+
+        fig.colorbar(im, ax=ax)
+        for (i, j), val in np.ndenumerate(cm):
+            ax.text(j, i, str(val), ha="center", va="center", color="black")
+        ax.set_xlabel("Предсказано")
+        ax.set_ylabel("Истина")
+        fig.tight_layout()
+        fig.savefig(path, dpi=150)
     
     # ==================================================================
     #                               АНАЛИЗ
@@ -721,12 +849,12 @@ class MainWindow(QMainWindow):
         вызывает ``generate_summary`` и сообщает путь к финальному отчёту.
         """
 
-        dlg = AnalysisDialog(self.current_surname, self._apply_widget_style, self)
+        dlg = AnalysisDialog(self.current_surname, self._START_QSS, self)
         if dlg.exec() != QDialog.DialogCode.Accepted:
             return
         
         sel = dlg.selections()
-        if not all(p.exists() for p in sel.values() if isinstance(p, Path)):
+        if missing_files(p for p in sel.values() if isinstance(p, Path)):
             QMessageBox.warning(self, "Ошибка", "Не все файлы существуют.")
             return
         
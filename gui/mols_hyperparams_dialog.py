@@ -8,16 +8,58 @@
 """
 
 from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QPainter, QLinearGradient, QColor, QFont
 from PyQt6.QtWidgets import (
     QDialog, QFormLayout, QSpinBox, QDialogButtonBox, QVBoxLayout,
     QWidget, QLabel, QAbstractSpinBox
 )
 
+from gui.background import set_gradient_background
+from gui.fonts import app_font
+
 
 class MOLsHyperparamsDialog(QDialog):
     """Окно для ввода гиперпараметров MOLs-теста."""
 
+    # Единая таблица стилей диалога: Qt разбирает её один раз,
+    # а не отдельный фрагмент на каждую подпись, поле и кнопку
+    _QSS = """
+        QLabel#formLabel {
+            background-color: rgba(255, 255, 255, 0.3);
+            border-radius: 6px;
+            padding: 4px 8px;
+            font-size: 14pt;
+            color: #333;
+        }
+        /* фон полей — здесь, а не через QPalette: как только к виджету
+           применяется хоть одно правило QSS, палитра для фона игнорируется */
+        QSpinBox, QPushButton {
+            background-color: rgba(255,255,255,0.9);
+            border: none;
+            border-radius: 8px;
+            font-size: 12pt;
+            color: #333;
+        }
+        QSpinBox    { padding: 6px; }
+        QPushButton { padding: 8px; }
+    """
+
+    # Поля формы: (атрибут, подпись, минимум, максимум, ключ hyps, отрицательный).
+    # «Отрицательные» параметры (downstream) хранятся в hyps со знаком минус,
+    # а в форме показываются по модулю.
+    _SPEC = (
+        # 1. Параметры моторов
+        ("sb_num_motor_start", "Первый мотор:",             0, 100, 'num_motor_start',     False),
+        ("sb_num_motor_end",   "Последний мотор:",          0, 100, 'num_motor_end',       False),
+        ("sb_use_motors_step", "Шаг моторов:",              1, 10,  'use_motors_step',     False),
+        ("sb_exps_each",       "Испытаний на мотор:",       1, 10,  'exps_for_each_motor', False),
+        # 2. Параметры downstream
+        ("sb_end_pwm_down",    "Последний ШИМ downstream:", 0, 255, 'end_pwm_down',        True),
+        ("sb_delta_pwm_down",  "Шаг ШИМа downstream:",      1, 100, 'delta_pwm_down',      True),
+        # 3. Параметры upstream
+        ("sb_end_pwm_up",      "Последний ШИМ upstream:",   0, 255, 'end_pwm_up',          False),
+        ("sb_delta_pwm_up",    "Шаг ШИМа upstream:",        1, 100, 'delta_pwm_up',        False),
+    )
+
     def __init__(self, hyps: dict, parent=None):
         """
         Параметры
@@ -34,6 +76,12 @@ class MOLsHyperparamsDialog(QDialog):
 
         self.hyps = hyps.copy()
 
+        # Таблица стилей применяется при первом показе (см. showEvent)
+        self._styled = False
+
+        # Градиентный фон заливает сам Qt по палитре; кисть ставит resizeEvent
+        self.setAutoFillBackground(True)
+
         # Центральный контейнер без фона
         container = QWidget(self)
         main_layout = QVBoxLayout(container)
@@ -47,82 +95,25 @@ class MOLsHyperparamsDialog(QDialog):
         form.setHorizontalSpacing(20)
         form.setVerticalSpacing(12)
 
-        # Общий стиль для меток-подписи
-        label_style = """
-            background-color: rgba(255, 255, 255, 0.3);
-            border-radius: 6px;
-            padding: 4px 8px;
-            font-size: 14pt;
-            color: #333;
-        """
-
         # --- Helper для создания промаркированных QLabel ---
+        # (стиль подписи — правило QLabel#formLabel в _QSS)
+        label_font = app_font(14)
+
         def make_label(text: str) -> QLabel:
             lbl = QLabel(text)
-            lbl.setStyleSheet(label_style)
-            lbl.setFont(QFont("", 14))
+            lbl.setObjectName("formLabel")
+            lbl.setFont(label_font)
             lbl.setAlignment(Qt.AlignmentFlag.AlignCenter)
             return lbl
 
-        # 1. Параметры моторов
-        self.sb_num_motor_start = QSpinBox()
-        self.sb_num_motor_start.setRange(0,100)
-        self.sb_num_motor_start.setValue(self.hyps['num_motor_start'])
-        form.addRow(make_label("Первый мотор:"), self.sb_num_motor_start)
-
-        self.sb_num_motor_end = QSpinBox()
-        self.sb_num_motor_end.setRange(0,100)
-        self.sb_num_motor_end.setValue(self.hyps['num_motor_end'])
-        form.addRow(make_label("Последний мотор:"), self.sb_num_motor_end)
-
-        self.sb_use_motors_step = QSpinBox()
-        self.sb_use_motors_step.setRange(1,10)
-        self.sb_use_motors_step.setValue(self.hyps['use_motors_step'])
-        form.addRow(make_label("Шаг моторов:"), self.sb_use_motors_step)
-
-        self.sb_exps_each = QSpinBox()
-        self.sb_exps_each.setRange(1,10)
-        self.sb_exps_each.setValue(self.hyps['exps_for_each_motor'])
-        form.addRow(make_label("Испытаний на мотор:"), self.sb_exps_each)
-
-        # 2. Параметры downstream
-        self.sb_end_pwm_down = QSpinBox()
-        self.sb_end_pwm_down.setRange(0,255)
-        self.sb_end_pwm_down.setValue(abs(self.hyps['end_pwm_down']))
-        form.addRow(make_label("Последний ШИМ downstream:"), self.sb_end_pwm_down)
-
-        self.sb_delta_pwm_down = QSpinBox()
-        self.sb_delta_pwm_down.setRange(1,100)
-        self.sb_delta_pwm_down.setValue(abs(self.hyps['delta_pwm_down']))
-        form.addRow(make_label("Шаг ШИМа downstream:"), self.sb_delta_pwm_down)
-
-        # 3. Параметры upstream
-        self.sb_end_pwm_up = QSpinBox()
-        self.sb_end_pwm_up.setRange(0,255)
-        self.sb_end_pwm_up.setValue(self.hyps['end_pwm_up'])
-        form.addRow(make_label("Последний ШИМ upstream:"), self.sb_end_pwm_up)
-
-        self.sb_delta_pwm_up = QSpinBox()
-        self.sb_delta_pwm_up.setRange(1,100)
-        self.sb_delta_pwm_up.setValue(self.hyps['delta_pwm_up'])
-        form.addRow(make_label("Шаг ШИМа upstream:"), self.sb_delta_pwm_up)
-
-        # Убираем стрелочки у всех SpinBox и стилизуем ввод
-        for sb in (
-            self.sb_num_motor_start, self.sb_num_motor_end,
-            self.sb_use_motors_step, self.sb_exps_each,
-            self.sb_end_pwm_down, self.sb_delta_pwm_down,
-            self.sb_end_pwm_up, self.sb_delta_pwm_up
-        ):
+        # Поля ввода — по таблице _SPEC (стиль ввода — в _QSS, стрелочки убираем)
+        for attr, label, lo, hi, key, negative in self._SPEC:
+            sb = QSpinBox()
+            sb.setRange(lo, hi)
+            sb.setValue(abs(self.hyps[key]) if negative else self.hyps[key])
             sb.setButtonSymbols(QAbstractSpinBox.ButtonSymbols.NoButtons)
-            sb.setStyleSheet("""
-                background-color: rgba(255,255,255,0.9);
-                border: none;
-                border-radius: 8px;
-                padding: 6px;
-                font-size: 12pt;
-                color: #333;
-            """)
+            setattr(self, attr, sb)
+            form.addRow(make_label(label), sb)
 
         # Кнопки ОК / Отмена
         buttons = QDialogButtonBox(
@@ -133,38 +124,35 @@ class MOLsHyperparamsDialog(QDialog):
         buttons.accepted.connect(self.accept)
         buttons.rejected.connect(self.reject)
 
-        # Стилизация кнопок
-        for btn in buttons.buttons():
-            btn.setStyleSheet("""
-                background-color: rgba(255,255,255,0.9);
-                border: none;
-                border-radius: 8px;
-                padding: 8px;
-                font-size: 12pt;
-                color: #333;
-            """)
-
         main_layout.addLayout(form)
         main_layout.addWidget(buttons)
         self.setLayout(main_layout)
 
-    def paintEvent(self, _):
-        """Отрисовывает градиентный фон окна как в MainWindow"""
-        painter = QPainter(self)
-        grad = QLinearGradient(0, 0, 0, self.height())
-        grad.setColorAt(0.0, QColor("#2ECC71"))
-        grad.setColorAt(1.0, QColor("#1ABC9C"))
-        painter.fillRect(self.rect(), grad)
+    # ---------------- Стили ------------------------------------------------
+    def _apply_styles(self):
+        """Стили всех подписей, полей и кнопок — одной таблицей."""
+        self.setStyleSheet(self._QSS)
+
+    def showEvent(self, event):
+        """
+        Применяет таблицу стилей один раз — при первом показе окна.
+        Конструктор не тратит время на разбор QSS, а до первой
+        отрисовки стили всё равно успевают примениться.
+        """
+        super().showEvent(event)
+        if not self._styled:
+            self._apply_styles()
+            self._styled = True
+
+    def resizeEvent(self, event):
+        """Растягивает градиент фона на новую высоту окна."""
+        set_gradient_background(self)
+        super().resizeEvent(event)
 
     def get_hyps(self) -> dict:
         """Возвращает словарь с актуальными значениями гиперпараметров."""
-        h = self.hyps
-        h['num_motor_start']     = self.sb_num_motor_start.value()
-        h['num_motor_end']       = self.sb_num_motor_end.value()
-        h['use_motors_step']     = self.sb_use_motors_step.value()
-        h['exps_for_each_motor'] = self.sb_exps_each.value()
-        h['end_pwm_down']        = -abs(self.sb_end_pwm_down.value())
-        h['delta_pwm_down']      = -abs(self.sb_delta_pwm_down.value())
-        h['end_pwm_up']          = self.sb_end_pwm_up.value()
-        h['delta_pwm_up']        = self.sb_delta_pwm_up.value()
+        h = dict(self.hyps)             # копия: self.hyps остаётся исходным
+        for attr, _, _, _, key, negative in self._SPEC:
+            value  = getattr(self, attr).value()
+            h[key] = -abs(value) if negative else value
         return h
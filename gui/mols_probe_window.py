@@ -4,13 +4,25 @@
 Окно MOLs‑теста.
 """
 
+from pathlib import Path
+
 from PyQt6 import uic
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, pyqtSlot
+from PyQt6.QtGui import QKeySequence, QShortcut
 from PyQt6.QtWidgets import QMainWindow
 
-class MOLsProbeWindow(QMainWindow):
+# Класс формы компилируется из window1.ui один раз — при импорте модуля,
+# а не разбором XML при создании каждого окна
+_Form, _ = uic.loadUiType(Path(__file__).with_name('window1.ui'))
+
+# Сочетания клавиш ответа создаются один раз и переиспользуются каждым окном
+_KEY_YES = QKeySequence(Qt.Key.Key_Left)
+_KEY_NO  = QKeySequence(Qt.Key.Key_Right)
+
+
+class MOLsProbeWindow(QMainWindow, _Form):
     """
-    Виджет для одного шага MOLs-теста, загружаемый из файла window1.ui.
+    Виджет для одного шага MOLs-теста, построенный по форме из файла window1.ui.
     
     В .ui предполагаются объекты:
       - QLabel с objectName="instruction"
@@ -32,15 +44,24 @@ class MOLsProbeWindow(QMainWindow):
         """
         super().__init__(parent)
 
-        # 1) Загрузка интерфейса из .ui
-        uic.loadUi('gui/window1.ui', self)
+        # 1) Построение интерфейса по скомпилированной форме .ui
+        self.setupUi(self)
+        # uic.loadUi раньше оставлял у корневой сетки нулевые поля — сохраняем вид
+        self.gridLayout.setContentsMargins(0, 0, 0, 0)
 
         self.main_win = parent
+        self.worker = None      # Поток теста; MainWindow присваивает его после создания окна
 
         # 2) Сохраняем общее число шагов и число тестов на мотор
         self.total_steps = total_steps
         self.tests_per_motor = tests_per_motor
 
+        # Последний показанный прогресс/фаза — повторы не перерисовываем
+        self._last_status: tuple | None = None
+        self._last_text  = ''
+        self._last_vib   = ''
+        self._last_state = ''
+
         # 3) Задаём начальные метки «Мотор 0» и «Шаг 0/tests_per_motor»
         self.TextLabel.setText(f'Мотор 0, шаг 0/{self.tests_per_motor}')
 
@@ -49,53 +70,94 @@ class MOLsProbeWindow(QMainWindow):
             btn.setFocusPolicy(Qt.FocusPolicy.NoFocus)
 
         # 5) Привязываем клики мышью к обработчику ответов
-        self.btnYes.clicked.connect(lambda: self.on_answer('y'))
-        self.btnNo.clicked.connect(lambda: self.on_answer('n'))
+        self.btnYes.clicked.connect(self._on_yes)
+        self.btnNo.clicked.connect(self._on_no)
 
         self.btnHome.clicked.connect(self._go_home)
 
+        # 6) Горячие клавиши «←» — чувствую, «→» — не чувствую
+        #    (контекст — всё окно: кнопки без фокуса, клавиши ловит само окно)
+        ctx = Qt.ShortcutContext.WindowShortcut
+        QShortcut(_KEY_YES, self, activated=self._on_yes, context=ctx)
+        QShortcut(_KEY_NO,  self, activated=self._on_no,  context=ctx)
+
         self.VibrationLabel.setText('')
 
     
-    def update_status(self, motor_idx: int, step_global: int, mode: str):
+    def update_status(self, motor_idx: int, step_global: int, total_steps: int, mode: str):
         """
         Обновление статусной информации в интерфейсе.
+        Сигнатура совпадает с ``MolsWorker.progress`` — слот подключается напрямую.
         
         Параметры:
             motor_idx: индекс текущего мотора
             step_global: глобальный номер шага теста
+            total_steps: общее число шагов (то же, что self.total_steps)
             mode: режим работы ("Увеличение мощности"/"Уменьшение мощности")
         """
         local = ((step_global - 1) % self.tests_per_motor) + 1
-        self.TextLabel.setText(f'Мотор {motor_idx}, шаг {local}/{self.tests_per_motor}')
-        self.VibrationLabel.setText(mode)
+        key   = (motor_idx, local, mode)
+        if key == self._last_status:
+            return
+        self._last_status = key
+
+        # Меняем только те метки, текст которых действительно другой,
+        # и обе — под одной перерисовкой окна
+        text = f'Мотор {motor_idx}, шаг {local}/{self.tests_per_motor}'
+        self.setUpdatesEnabled(False)
+        if text != self._last_text:
+            self._last_text = text
+            self.TextLabel.setText(text)
+        if mode != self._last_vib:
+            self._last_vib = mode
+            self.VibrationLabel.setText(mode)
+        self.setUpdatesEnabled(True)
+
+
+    def set_state(self, state: str):
+        """
+        Показывает фазу шага («ВИБРАЦИЯ» / «Почувствовали?»).
+        Слот сигнала ``MolsWorker.stateChanged``.
+        """
+        if state != self._last_state:
+            self._last_state = state
+            self.ProcessLabel.setText(state)
+
+
+    @pyqtSlot()
+    def _on_yes(self):
+        """Кнопка «Чувствую» / клавиша «←»."""
+        self._send_answer('y')
 
+    @pyqtSlot()
+    def _on_no(self):
+        """Кнопка «Не чувствую» / клавиша «→»."""
+        self._send_answer('n')
 
-    def on_answer(self, ans: str):
+    def _send_answer(self, ans: str):
         """
         Обработчик выбора пользователя ("Чувствую"/"Не чувствую").
-        Передаёт ответ потоку через родительский MainWindow.
+        Передаёт ответ напрямую потоку теста.
         
         Параметры:
             ans: символ ответа ('y' - да, 'n' - нет)
         """
-        # Предполагаем, что родитель — это MainWindow, у него есть self.worker
-        mw = self.window()                                     # получаем корневое окно
-        if hasattr(mw, 'worker') and mw.worker is not None:    # если есть рабочий поток
-            mw.worker.set_answer(ans)                          # передаем ответ
+        w = self.worker
+        if w is not None:
+            w.set_answer(ans)
     
 
 
     def _go_home(self):
         """Возврат в главное меню с корректной остановкой теста."""
-        # 1) Останавливаем тестовый поток
-        if hasattr(self.main_win, 'worker') and self.main_win.worker.isRunning():
-            self.main_win.worker.stop()
-            self.main_win.worker.wait(1000)
+        # 1) Останавливаем тестовый поток (тот же, что у MainWindow)
+        w = self.worker
+        if w is not None and w.isRunning():
+            w.stop()
+            w.wait(1000)
         # 2) Выключаем моторы
         self.main_win.vibro.reset_pwm_values()
         # 3) Закрываем окно теста
         self.close()
         # 4) Восстанавливаем главное меню
-        self.main_win._build_start_ui()
-        self.main_win.show()
+        self.main_win._show_start_ui()
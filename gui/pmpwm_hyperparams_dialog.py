@@ -6,14 +6,30 @@
 Позволяет пользователю выбрать параметры теста перед запуском.
 """
 
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QPainter, QLinearGradient, QColor, QFont
+import re
+from functools import lru_cache
+
+from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtWidgets import (
     QDialog, QFormLayout, QVBoxLayout, QLabel, QComboBox,
     QDialogButtonBox, QSpinBox, QLineEdit, QAbstractSpinBox, QWidget,
     QHBoxLayout, QPushButton
 )
 
+from gui.background import set_gradient_background
+from gui.fonts import app_font
+
+
+# Целые числа в строке PWM-значений (любые разделители)
+_PWM_RE = re.compile(r'\d+')
+
+
+# Отложенный импорт учебного окна (как в Spatial-диалоге)
+def _train_window():
+    from gui.pmpwm_training_window import PMPWMTrainingWindow
+    return PMPWMTrainingWindow
+
+
 class PMPWMHyperparamsDialog(QDialog):
     """
     Диалог выбора гиперпараметров для PM-PWM-теста.
@@ -25,6 +41,61 @@ class PMPWMHyperparamsDialog(QDialog):
       • Словарь PWM (список значений через запятую)
       • Rоличество повторов подачи каждого PWM
     """
+
+    # Единая таблица стилей диалога: Qt разбирает её один раз,
+    # а не отдельный фрагмент на каждый виджет
+    _QSS = """
+        QLabel#formLabel {
+            background-color: rgba(255,255,255,0.3);
+            border-radius: 6px; padding:4px 8px;
+            font-size: 14pt; color:#333;
+        }
+        /* фон полей — здесь, а не через QPalette: как только к виджету
+           применяется хоть одно правило QSS, палитра для фона игнорируется */
+        QSpinBox, QLineEdit#pwmEdit {
+            background-color: rgba(255,255,255,0.9);
+            border:none; border-radius:8px; padding:6px;
+            font-size:12pt; color:#333;
+        }
+        QPushButton {
+            background-color: rgba(255,255,255,0.9);
+            border:none; border-radius:8px; padding:8px;
+            font-size:12pt; color:#333;
+        }
+        QPushButton#trainBtn {
+            padding:10px 20px;
+            font-size:13pt;
+        }
+        QComboBox {
+            background-color: rgba(255,255,255,0.9);
+            border: none;
+            border-radius: 8px;
+            /* чуть больший отступ справа, чтобы текст не упирался */
+            padding: 6px 12px 6px 6px;
+            font-size: 12pt;
+            color: #333;
+        }
+        /* делаем область drop-down нулевой ширины */
+        QComboBox::drop-down {
+            subcontrol-origin: padding;
+            subcontrol-position: top right;
+            width: 0px;
+            border: none;
+        }
+        /* окончательно убираем саму стрелку, даже в раскрытом состоянии */
+        QComboBox::down-arrow,
+        QComboBox::down-arrow:on {
+            image: none;
+            width: 0px;
+            height: 0px;
+        }
+        /* стиль выпадающего списка */
+        QComboBox QAbstractItemView {
+            background-color: white;
+            border: 1px solid #ccc;
+            padding: 4px;
+        }
+    """
     def __init__(self, hyps: dict, parent=None):
         """
         Инициализирует диалог и создаёт интерфейс.
@@ -39,6 +110,12 @@ class PMPWMHyperparamsDialog(QDialog):
 
         self.hyps = hyps.copy() # Копируем, чтобы не менять исходные данные напрямую
 
+        # Таблица стилей применяется при первом показе (см. showEvent)
+        self._styled = False
+
+        # Градиентный фон заливает сам Qt по палитре; кисть ставит resizeEvent
+        self.setAutoFillBackground(True)
+
         # ---------------- Основной layout -------------------
         v = QVBoxLayout(self)
         v.setContentsMargins(20, 20, 20, 20)
@@ -51,18 +128,16 @@ class PMPWMHyperparamsDialog(QDialog):
         form.setHorizontalSpacing(20)
         form.setVerticalSpacing(12)
 
+        label_font = app_font(14)
+
         def make_label(text: str) -> QLabel:
             """
             Создаёт аккуратную подпись с лёгкой подсветкой фона.
-            Стили подобраны под общую тему диалога.
+            Стиль — правило QLabel#formLabel в _QSS.
             """
             lbl = QLabel(text)
-            lbl.setStyleSheet("""
-                background-color: rgba(255,255,255,0.3);
-                border-radius: 6px; padding:4px 8px;
-                font-size: 14pt; color:#333;
-            """)
-            lbl.setFont(QFont("", 14))
+            lbl.setObjectName("formLabel")
+            lbl.setFont(label_font)
             lbl.setAlignment(Qt.AlignmentFlag.AlignCenter)
             return lbl
 
@@ -79,38 +154,8 @@ class PMPWMHyperparamsDialog(QDialog):
         form.addRow(make_label("Последний мотор:"), self.sb_end)
 
         # ---------------- 2) Шаг по моторам ------------------------------
-        self.cb_step = QComboBox()
-        self.cb_step.setStyleSheet("""
-            QComboBox {
-                background-color: rgba(255,255,255,0.9);
-                border: none;
-                border-radius: 8px;
-                /* чуть больший отступ справа, чтобы текст не упирался */
-                padding: 6px 12px 6px 6px;
-                font-size: 12pt;
-                color: #333;
-            }
-            /* делаем область drop-down нулевой ширины */
-            QComboBox::drop-down {
-                subcontrol-origin: padding;
-                subcontrol-position: top right;
-                width: 0px;
-                border: none;
-            }
-            /* окончательно убираем саму стрелку, даже в раскрытом состоянии */
-            QComboBox::down-arrow,
-            QComboBox::down-arrow:on {
-                image: none;
-                width: 0px;
-                height: 0px;
-            }
-            /* стиль выпадающего списка */
-            QComboBox QAbstractItemView {
-                background-color: white;
-                border: 1px solid #ccc;
-                padding: 4px;
-            }
-        """)
+        self.cb_step = QComboBox()          # стиль и скрытая стрелка — в _QSS
+        self._last_allowed: tuple[int, ...] | None = None   # шаги, показанные в cb_step
 
         step_container = QWidget()
         hl = QHBoxLayout(step_container)
@@ -121,6 +166,7 @@ class PMPWMHyperparamsDialog(QDialog):
 
         # ---------------- 3) Список PWM-значений -------------------------
         self.le_pwms = QLineEdit()
+        self.le_pwms.setObjectName("pwmEdit")
         self.le_pwms.setPlaceholderText("14,22,36,60,100")
         self.le_pwms.setText(",".join(map(str, self.hyps['pmpwm_pwm_values'])))
         form.addRow(make_label("PWM-значения:"), self.le_pwms)
@@ -133,27 +179,17 @@ class PMPWMHyperparamsDialog(QDialog):
 
         # ---------------- 5) Кнопка «Начать обучение» --------------------
         self.btn_train = QPushButton("Начать обучение")
+        self.btn_train.setObjectName("trainBtn")
         self.btn_train.setFixedWidth(220)
-        self.btn_train.setStyleSheet("""
-            background-color: rgba(255,255,255,0.9);
-            border:none; border-radius:8px; padding:10px 20px;
-            font-size:13pt; color:#333;
-        """)
         # Отдельный горизонтальный layout, чтобы кнопка была по центру
         hl_train = QHBoxLayout()
         hl_train.addStretch()
         hl_train.addWidget(self.btn_train)
         hl_train.addStretch()
 
-        # Стилизуем spinbox'ы и combobox
-        for w in (self.sb_start, self.sb_end, self.sb_repeats, self.le_pwms):
-            if isinstance(w, QSpinBox):
-                w.setButtonSymbols(QAbstractSpinBox.ButtonSymbols.NoButtons)
-            w.setStyleSheet("""
-                background-color: rgba(255,255,255,0.9);
-                border:none; border-radius:8px; padding:6px;
-                font-size:12pt; color:#333;
-            """)
+        # Убираем стрелочки у spinbox'ов (стили полей — в _QSS)
+        for w in (self.sb_start, self.sb_end, self.sb_repeats):
+            w.setButtonSymbols(QAbstractSpinBox.ButtonSymbols.NoButtons)
 
         # ---------------- Кнопки OK / Cancel ------------------------------
         buttons = QDialogButtonBox(
@@ -161,12 +197,6 @@ class PMPWMHyperparamsDialog(QDialog):
         )
         buttons.accepted.connect(self.accept)
         buttons.rejected.connect(self.reject)
-        for b in buttons.buttons():
-            b.setStyleSheet("""
-                background-color: rgba(255,255,255,0.9);
-                border:none; border-radius:8px; padding:8px;
-                font-size:12pt; color:#333;
-            """)
 
         v.addLayout(form)
         # 1) растягиватель перед кнопкой
@@ -184,10 +214,14 @@ class PMPWMHyperparamsDialog(QDialog):
         self.btn_train.clicked.connect(self._start_training)
         # Первичная инициализация доступных шагов по текущему диапазону.
         self._on_range_changed()
+        # Модуль учебного окна подгружаем заранее, когда цикл событий
+        # освободится, — клик «Начать обучение» не ждёт импорта.
+        QTimer.singleShot(0, _train_window)
 
     # ---------------- Вспомогательные методы -----------------------------
     @staticmethod
-    def _allowed_steps(total: int) -> list[int]:
+    @lru_cache(maxsize=128)
+    def _allowed_steps(total: int) -> tuple[int, ...]:
         """
         Возвращает список допустимых шагов по диапазону моторов.
 
@@ -200,14 +234,15 @@ class PMPWMHyperparamsDialog(QDialog):
             total: Размер диапазона (кол-во моторов в выборке), >= 1.
 
         Возвращает:
-            Отсортированный список уникальных шагов (1, 2, 3).
+            Отсортированный кортеж уникальных шагов (1, 2, 3). Результат
+            кэшируется: total принимает лишь ~100 значений.
         """
         steps = [1]
         if total % 2 == 0:
             steps.append(2)
         if total % 3 == 0:
             steps.append(3)
-        return sorted(set(steps))
+        return tuple(sorted(set(steps)))
 
     def _on_range_changed(self):
         """
@@ -216,19 +251,44 @@ class PMPWMHyperparamsDialog(QDialog):
         # Количество моторов в диапазоне: последняя позиция включительно.
         total = max(1, self.sb_end.value() - self.sb_start.value() + 1)
         allowed = self._allowed_steps(total)
-        # Обновляем комбобокс значениями 1/2/3 (в зависимости от total).
-        self.cb_step.clear()
-        self.cb_step.addItems([str(s) for s in allowed])
-        # По умолчанию выбираем шаг 2, если он допустим, иначе — первый из списка.
-        self.cb_step.setCurrentText('2' if '2' in [str(s) for s in allowed] else self.cb_step.itemText(0))
-
-    # ---------------- Рисование фона с градиентом ------------------------
-    def paintEvent(self, _):
-        painter = QPainter(self)
-        grad = QLinearGradient(0, 0, 0, self.height())
-        grad.setColorAt(0.0, QColor("#2ECC71"))
-        grad.setColorAt(1.0, QColor("#1ABC9C"))
-        painter.fillRect(self.rect(), grad)
+        # Набор шагов не изменился — список и выбор пользователя оставляем как есть.
+        if allowed == self._last_allowed:
+            return
+        self._last_allowed = allowed
+
+        # Обновляем комбобокс значениями 1/2/3 (в зависимости от total)
+        # без промежуточных currentIndexChanged на clear/addItems.
+        strs = [str(s) for s in allowed]
+        self.cb_step.blockSignals(True)
+        try:
+            self.cb_step.clear()
+            self.cb_step.addItems(strs)
+            # По умолчанию выбираем шаг 2, если он допустим, иначе — первый из списка.
+            self.cb_step.setCurrentText('2' if '2' in strs else strs[0])
+        finally:
+            self.cb_step.blockSignals(False)
+
+    # ---------------- Стили ------------------------------------------------
+    def _apply_styles(self):
+        """Стили всех подписей, полей и кнопок — одной таблицей."""
+        self.setStyleSheet(self._QSS)
+
+    def showEvent(self, event):
+        """
+        Применяет таблицу стилей один раз — при первом показе окна.
+        Конструктор не тратит время на разбор QSS, а до первой
+        отрисовки стили всё равно успевают примениться.
+        """
+        super().showEvent(event)
+        if not self._styled:
+            self._apply_styles()
+            self._styled = True
+
+    # ---------------- Фон с градиентом -----------------------------------
+    def resizeEvent(self, event):
+        """Растягивает градиент фона на новую высоту окна."""
+        set_gradient_background(self)
+        super().resizeEvent(event)
 
     # ---------------- Сбор итоговых гиперпараметров ----------------------
     def get_hyps(self) -> dict:
@@ -241,23 +301,16 @@ class PMPWMHyperparamsDialog(QDialog):
         Возвращает:
             dict[str, Any]: Обновлённые гиперпараметры.
         """
-        h = self.hyps
+        h = dict(self.hyps)             # копия: self.hyps остаётся исходным
         h['num_motor_start']  = self.sb_start.value()
         h['num_motor_end']    = self.sb_end.value()
         h['use_motors_step']  = int(self.cb_step.currentText())
         h['pmpwm_repeats']    = self.sb_repeats.value()
 
-        # Разбор PWM-строки: поддерживаем гибкие пробелы, убираем дубли, сортируем.
-        txt = self.le_pwms.text().strip()
-        try:
-            pwms = [int(x) for x in txt.split(',') if x.strip()]
-            pwms = sorted(set(pwms))
-            if not pwms:
-                raise ValueError
-        except Exception:
-            # Если парсинг не удался — откатываем список PWM к исходному.
-            pwms = self.hyps['pmpwm_pwm_values']
-        h['pmpwm_pwm_values'] = pwms
+        # Разбор PWM-строки: берём все целые числа, убираем дубли, сортируем.
+        # Если чисел нет — оставляем исходный список PWM.
+        nums = _PWM_RE.findall(self.le_pwms.text())
+        h['pmpwm_pwm_values'] = sorted({int(n) for n in nums}) if nums else h['pmpwm_pwm_values']
         return h
     
 
@@ -276,7 +329,7 @@ class PMPWMHyperparamsDialog(QDialog):
         ))
 
         # 3) Получаем VibroBox от главного окна
-        from gui.pmpwm_training_window import PMPWMTrainingWindow
+        PMPWMTrainingWindow = _train_window()           # уже импортирован заранее
         main_win = self.parent()
         vibro = getattr(main_win, 'vibro', None)
 
@@ -14,11 +14,18 @@
 """
 
 from PyQt6.QtWidgets import (
-    QMainWindow, QWidget, QLabel, QPushButton, QVBoxLayout,
+    QMainWindow, QWidget, QLabel, QPushButton, QButtonGroup, QVBoxLayout,
     QHBoxLayout, QGridLayout, QInputDialog, QMessageBox
 )
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QPainter, QLinearGradient, QColor, QKeySequence, QShortcut
+from PyQt6.QtCore import Qt, QTimer, pyqtSlot
+
+from gui.background import set_gradient_background
+
+
+# Локальный импорт, чтобы не плодить зависимость между окнами
+def _train_window():
+    from gui.pmpwm_training_window import PMPWMTrainingWindow
+    return PMPWMTrainingWindow
 
 
 class PMPWMProbeWindow(QMainWindow):
@@ -34,31 +41,52 @@ class PMPWMProbeWindow(QMainWindow):
       • цифры 1…n_levels дублируют нажатие одноимённых кнопок.
     """
 
-    def __init__(self, n_levels: int, style_fn, parent=None):
+    # Стиль всех кнопок окна (как _WIDGET_STYLE главного окна). Задаётся одной
+    # таблицей на центральный виджет, а не отдельным setStyleSheet на кнопку.
+    _BTN_QSS = """
+        QPushButton {
+            background-color: rgba(255,255,255,0.9);
+            border: none;
+            border-radius: 12px;
+            padding: 8px;
+            font-size: 12pt;
+            color: #333;
+        }
+    """
+
+    def __init__(self, n_levels: int, parent=None):
         """
         Создаёт окно опроса с сеткой кнопок 1…n_levels.
 
         Параметры:
             n_levels: Сколько уровней доступно пользователю (кол-во кнопок).
-            style_fn: Функция стилизации виджетов (применяется к кнопкам).
             parent: Родительское окно.
         """
                 
         super().__init__(parent)
         
+        # Число кнопок-уровней: цифры 1…min(n_levels, 9) на клавиатуре — ответы.
+        self._n_levels = n_levels
+
         # Текущий мотор, для которого идёт опрос; заполняется в update_status().
         self._current_motor: int | None = None
 
+        # Последний показанный прогресс — повторы не перерисовываем.
+        self._last_status: tuple | None = None
+
+        # Градиентный фон заливает сам Qt по палитре; кисть ставит resizeEvent
+        self.setAutoFillBackground(True)
+
         # Базовые параметры окна.
         self.setWindowTitle("PM-PWM-тест")
         self.setMinimumWidth(520)
 
         # Сохраняем внешние зависимости.
-        self._apply_style = style_fn
-        self.main_win     = parent
+        self.main_win = parent
 
         # ---------- Центральная компоновка ----------
         central = QWidget(self)
+        central.setStyleSheet(self._BTN_QSS)
         self.setCentralWidget(central)
         v = QVBoxLayout(central)
         v.setAlignment(Qt.AlignmentFlag.AlignTop)
@@ -80,22 +108,23 @@ class PMPWMProbeWindow(QMainWindow):
         g.setVerticalSpacing(12)
         v.addLayout(g)
 
+        # Все кнопки уровней — в одной группе: id кнопки и есть ответ,
+        # клик приходит одним сигналом idClicked(int) без замыкания на кнопку.
+        self._answer_group = QButtonGroup(self)
+        self._answer_group.idClicked.connect(self._send_answer)
+
         cols = 5 # Кнопки делим на 5 столбцов (визуально компактно).
-        for i in range(1, n_levels + 1):
+        # Позиции (ряд, столбец) по порядку уровней
+        cells = (divmod(k, cols) for k in range(n_levels))
+        for i, (r, c) in enumerate(cells, start=1):
             # Создаём кнопку с цифрой i
             btn = QPushButton(str(i))
             btn.setMinimumSize(75, 60)
             # Снимаем фокус, чтобы стрелки/цифры работали без «залипания».
             btn.setFocusPolicy(Qt.FocusPolicy.NoFocus)
-            self._apply_style(btn)
-            btn.clicked.connect(lambda _, val=i: self._send_answer(val))
-            r, c = divmod(i - 1, cols)
+            self._answer_group.addButton(btn, i)
             g.addWidget(btn, r, c)
-
-            # Горячая клавиша: нажатие цифры на клавиатуре эквивалентно клику.
-            QShortcut(QKeySequence(str(i)), self,
-                      activated=lambda val=i: self._send_answer(val))
-        
+        # Горячие клавиши-цифры обрабатывает keyPressEvent (без QShortcut на кнопку).
 
 
         # ---------- Нижняя панель действий (слева направо) ----------
@@ -104,20 +133,17 @@ class PMPWMProbeWindow(QMainWindow):
 
         # Кнопка «Обучение»: временно останавливает тест и открывает тренажёр.
         self.btn_train = QPushButton("Обучение")
-        self._apply_style(self.btn_train)
         # вставляем *перед* btn_rewrite, чтобы оказаться слева
         hl_bottom.addWidget(self.btn_train, 0)      # индекс 0 ⇒ первый в ряду
         self.btn_train.clicked.connect(self._open_training)
 
         # Кнопка «Переписать»: повторный прогон конкретного уже завершённого мотора.
         self.btn_rewrite = QPushButton("Переписать")
-        self._apply_style(self.btn_rewrite)
         self.btn_rewrite.clicked.connect(self._rewrite)
         hl_bottom.addWidget(self.btn_rewrite)
 
         # Кнопка «Завершить тест»: отображается только когда тест действительно готов.
         self.btn_finish = QPushButton("Завершить тест")
-        self._apply_style(self.btn_finish)
         self.btn_finish.clicked.connect(self.main_win._finish_pmpwm)
         self.btn_finish.hide()                       # скрыта до ready
         hl_bottom.addWidget(self.btn_finish)
@@ -127,25 +153,34 @@ class PMPWMProbeWindow(QMainWindow):
 
         # ---------- Отдельная строка с кнопкой «Стоп» ----------
         # «Стоп» мягко завершает текущий поток и возвращает на старт.
-        hl = QHBoxLayout()
-        hl.addStretch()
+        # Прижата вправо выравниванием — без отдельного layout со stretch.
         self.btn_stop = QPushButton('Стоп')
-        self._apply_style(self.btn_stop)
         self.btn_stop.clicked.connect(self._stop_test)
-        hl.addWidget(self.btn_stop)
-        v.addLayout(hl)
+        v.addWidget(self.btn_stop, alignment=Qt.AlignmentFlag.AlignRight)
+
+        # Модуль тренажёра подгружаем, как только освободится цикл событий, —
+        # кнопка «Обучение» открывает окно без паузы на импорт.
+        QTimer.singleShot(0, _train_window)
 
     # ======================================================================
     #                    СЛУЖЕБНЫЕ / ТЕХНИЧЕСКИЕ МЕТОДЫ
     # ======================================================================
 
-    def paintEvent(self, _):
-        """Рисует вертикальный градиентный фон для всего окна."""
-        p = QPainter(self)
-        grad = QLinearGradient(0, 0, 0, self.height())
-        grad.setColorAt(0.0, QColor("#2ECC71"))
-        grad.setColorAt(1.0, QColor("#1ABC9C"))
-        p.fillRect(self.rect(), grad)
+    def resizeEvent(self, event):
+        """Растягивает градиент фона на новую высоту окна."""
+        set_gradient_background(self)
+        super().resizeEvent(event)
+
+    def keyPressEvent(self, event):
+        """Цифра 1…9 на клавиатуре эквивалентна клику по кнопке уровня."""
+        k = event.key()
+        if (Qt.Key.Key_1 <= k <= Qt.Key.Key_9
+                and not event.modifiers() & ~Qt.KeyboardModifier.KeypadModifier):
+            val = k - Qt.Key.Key_0
+            if val <= self._n_levels:
+                self._send_answer(val)
+                return
+        super().keyPressEvent(event)
 
     # ======================================================================
     #                          ПУБЛИЧНЫЕ МЕТОДЫ API
@@ -157,6 +192,9 @@ class PMPWMProbeWindow(QMainWindow):
         # могла корректно обработать «возврат в тест».
         self._current_motor = motor_idx
 
+        if (motor_idx, done, total) == self._last_status:
+            return
+        self._last_status = (motor_idx, done, total)
         self.lbl_title.setText(f"Мотор {motor_idx} — {done}/{total}")
 
 
@@ -168,6 +206,7 @@ class PMPWMProbeWindow(QMainWindow):
     #                           ОБРАБОТКА ДЕЙСТВИЙ
     # ======================================================================
 
+    @pyqtSlot(int)
     def _send_answer(self, val: int):
         """Отправляет ответ пользователя в рабочий поток."""
         w = self.main_win.worker
@@ -175,6 +214,7 @@ class PMPWMProbeWindow(QMainWindow):
             w.set_answer(val)
 
 
+    @pyqtSlot()
     def _stop_test(self):
         """Прерывает тест и возвращает пользователя на стартовый экран."""
         # 1) Мягко останавливаем поток
@@ -190,10 +230,10 @@ class PMPWMProbeWindow(QMainWindow):
         self.close()
 
         # 4) Восстанавливаем главное меню
-        self.main_win._build_start_ui()   # пересоздаёт центральный layout
-        self.main_win.show()              # снова делает окно видимым
+        self.main_win._show_start_ui()    # снова делает главное окно видимым
 
 
+    @pyqtSlot()
     def _rewrite(self):
         """Запросить перезапись одного из уже завершённых моторов."""
         finished = sorted(self.main_win.motors_completed)
@@ -220,19 +260,16 @@ class PMPWMProbeWindow(QMainWindow):
             w.wait(1000)
 
         # 2) Если мотор уже считался, удаляем его данные
-        self.main_win.motors_completed.discard(motor)
-        self.main_win.results_pmpwm.pop(motor, None)
-
         # 3) Формируем очередь: сначала переписываем motor,
         #    затем всё, что ещё НЕ завершено
-        rest = [m for m in self.main_win.motors_all
-                if m not in self.main_win.motors_completed and m != motor]
+        rest = self.main_win._reopen_motor(motor)
         self.main_win._pending_queue = rest          # запомнили «хвост»
 
         # 4) Запускаем воркер только для выбранного мотора
         self.main_win._launch_pmpwm_worker([motor])
 
 
+    @pyqtSlot()
     def _open_training(self):
         """
         Ставит текущий тест на паузу (с удалением частичных данных текущего незавершённого мотора),
@@ -251,10 +288,7 @@ class PMPWMProbeWindow(QMainWindow):
             self.main_win.drop_partial_pmpwm_data(current_motor)
 
             # 4) Формируем очередь: этот мотор + все незавершённые
-            pending = [current_motor] + [
-                m for m in self.main_win.motors_all
-                if m not in self.main_win.motors_completed and m != current_motor
-            ]
+            pending = [current_motor] + self.main_win._pending_after(current_motor)
 
             self.main_win._pending_queue = pending
         else:
@@ -262,7 +296,7 @@ class PMPWMProbeWindow(QMainWindow):
             self.main_win._pending_queue = []
 
         # 5) Открываем обучающее окно в free-mode
-        from gui.pmpwm_training_window import PMPWMTrainingWindow # локальный импорт, чтобы не плодить зависимость
+        PMPWMTrainingWindow = _train_window()        # уже импортирован заранее
         self._train_win = PMPWMTrainingWindow(
             vibro=self.main_win.vibro,
             motors=self.main_win.motors_all,
@@ -274,6 +308,7 @@ class PMPWMProbeWindow(QMainWindow):
         self._train_win.show()
 
 
+    @pyqtSlot()
     def _resume_test(self, _=None):
         """
         Возобновляет тест после закрытия окна обучения.
@@ -288,8 +323,7 @@ class PMPWMProbeWindow(QMainWindow):
             self.main_win._pending_queue.clear()
         else:
             # Ничего не осталось — возвращаем пользователя на главный экран
-            self.main_win._build_start_ui()
-            self.main_win.show()
+            self.main_win._show_start_ui()
 
 
 
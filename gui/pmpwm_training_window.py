@@ -12,16 +12,22 @@
 начиная с ручного режима.
 """
 
-import time
+from functools import partial
+
 import numpy as np
 
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer
-from PyQt6.QtGui  import QPainter, QLinearGradient, QColor, QShortcut, QKeySequence
+from PyQt6.QtCore import (
+    Qt, QDeadlineTimer, QMutex, QMutexLocker, QThread, QTimer, QWaitCondition,
+    pyqtSignal, pyqtSlot
+)
+from PyQt6.QtGui  import QShortcut, QKeySequence
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QLabel, QVBoxLayout, QPushButton
 )
 
 from core.serial_api import VibroBox
+from gui.background import set_gradient_background
+from gui.fonts import app_font
 
 # ============================================================
 #       Фоновый поток для автоматической демонстрации
@@ -38,21 +44,50 @@ class DemoThread(QThread):
     def __init__(self, vibro: VibroBox, motors, pwm_vals, pause=0.6):
         super().__init__()
         self.vibro, self.motors, self.pwms, self.pause = vibro, motors, pwm_vals, pause
+        # Кадр PWM переиспользуется на всех шагах (VibroBox копирует его при записи)
+        self._buf = np.zeros(vibro.n_motors, dtype=np.uint8)
+
+        # Остановка из GUI‑потока прерывает текущую паузу сразу (см. stop)
+        self._mutex = QMutex()
+        self._cond  = QWaitCondition()
+        self._stop  = False
+
+    def stop(self):
+        """Запросить остановку демонстрации; текущая пауза прерывается."""
+        with QMutexLocker(self._mutex):
+            self._stop = True
+            self._cond.wakeAll()
+
+    def _interruptible_sleep(self, ms: int):
+        """Пауза на ``ms`` миллисекунд, которую :meth:`stop` прерывает сразу."""
+        deadline = QDeadlineTimer(ms)
+        self._mutex.lock()
+        while not self._stop and not deadline.hasExpired():
+            self._cond.wait(self._mutex, deadline)
+        self._mutex.unlock()
 
     def run(self):
-        """Проигрываем каждый PWM на каждом моторе по очереди."""
-        arr = np.zeros(self.vibro.n_motors, dtype=np.uint8)
+        """
+        Проигрываем каждый PWM на каждом моторе по очереди.
+        Каждый уровень — отдельный импульс с паузой 0.3 с, как в самом тесте.
+        Паузы прерываются :meth:`stop`: закрытое окно выключает моторы
+        и останавливает демонстрацию сразу, не дожидаясь конца шага.
+        """
+        arr = self._buf
         for m in self.motors:
+            # Обнуляем все моторы — в кадре горит только текущий
+            arr.fill(0)
             for p in self.pwms:
-                # Обнуляем все моторы
-                arr[:] = 0
+                # Окно закрыто — выходим (моторы уже выключены прошлым шагом)
+                if self._stop:
+                    return
                 # Выставляем PWM только для текущего мотора
                 arr[m] = p
                 self.vibro.set_pwm_values(arr)
-                time.sleep(self.pause)
-                # Сбрасываем значения
+                self._interruptible_sleep(int(self.pause * 1000))
+                # Сбрасываем значения (и при остановке посреди импульса)
                 self.vibro.reset_pwm_values()
-                time.sleep(0.3)
+                self._interruptible_sleep(300)
 
         # По завершении шлём сигнал
         self.finished_demo.emit()
@@ -81,6 +116,19 @@ class PMPWMTrainingWindow(QMainWindow):
         
         self.free_mode = free_mode
 
+        # Кадр PWM для ручного режима — один на окно, а не на каждое нажатие
+        self._pwm_buf = np.zeros(vibro.n_motors, dtype=np.uint8)
+
+        # Авто-выключение вибрации: один перезапускаемый таймер, поэтому серия
+        # нажатий даёт один сброс через 600 мс после последнего нажатия
+        self._off_timer = QTimer(self)
+        self._off_timer.setSingleShot(True)
+        self._off_timer.setInterval(600)
+        self._off_timer.timeout.connect(self.vibro.reset_pwm_values_async)
+
+        # Градиентный фон заливает сам Qt по палитре; кисть ставит resizeEvent
+        self.setAutoFillBackground(True)
+
         # ---------- UI ----------
         central = QWidget(self)
         self.setCentralWidget(central)
@@ -92,17 +140,17 @@ class PMPWMTrainingWindow(QMainWindow):
         self.lbl_info = QLabel(
             "Демонстрация сигналов…", alignment=Qt.AlignmentFlag.AlignCenter
         )
-        self.lbl_info.setStyleSheet("font-size: 16pt;")
+        self.lbl_info.setFont(app_font(16))
         v.addWidget(self.lbl_info)
 
         # Метка статуса: какой мотор и PWM сейчас активны
         self.lbl_status = QLabel("", alignment=Qt.AlignmentFlag.AlignCenter)
-        self.lbl_status.setStyleSheet("font-size: 14pt;")
+        self.lbl_status.setFont(app_font(14))
         v.addWidget(self.lbl_status)
 
         # Кнопка «Закрыть»
         self.btn_exit = QPushButton("Закрыть")
-        self.btn_exit.setStyleSheet("font-size: 12pt;")
+        self.btn_exit.setFont(app_font(12))
         self.btn_exit.clicked.connect(self.close)
         v.addWidget(self.btn_exit)
 
@@ -119,20 +167,22 @@ class PMPWMTrainingWindow(QMainWindow):
 
 
     def closeEvent(self, event):
-        """Отправляет сигнал closed перед обычным закрытием."""
+        """Останавливает демонстрацию и отправляет сигнал closed."""
+        demo = getattr(self, 'demo', None)
+        if demo is not None and demo.isRunning():
+            demo.stop()
+            demo.wait()         # пауза прервана: поток сразу гасит моторы и выходит
         super().closeEvent(event)
         self.closed.emit()
 
 
-    def paintEvent(self, _):
-        """Рисует вертикальный градиентный фон."""
-        p = QPainter(self)
-        g = QLinearGradient(0, 0, 0, self.height())
-        g.setColorAt(0.0, QColor("#2ECC71"))
-        g.setColorAt(1.0, QColor("#1ABC9C"))
-        p.fillRect(self.rect(), g)
+    def resizeEvent(self, event):
+        """Растягивает градиент фона на новую высоту окна."""
+        set_gradient_background(self)
+        super().resizeEvent(event)
 
 
+    @pyqtSlot()
     def _on_demo_finished(self):
         """
         Переводит интерфейс в режим ручного управления моторами/PWM.
@@ -147,49 +197,53 @@ class PMPWMTrainingWindow(QMainWindow):
         )
 
         # Начальные значения: первый мотор, первый PWM
+        self._idx_motor = 0
         self._current_motor = self.motors[0]
         self._idx_pwm = 0
         self._apply_vibration()
 
-        # Горячие клавиши
-        QShortcut(QKeySequence(Qt.Key.Key_Left),  self,
-                  activated=lambda: self._step_motor(-1))
-        QShortcut(QKeySequence(Qt.Key.Key_Right), self,
-                  activated=lambda: self._step_motor(+1))
-        QShortcut(QKeySequence(Qt.Key.Key_Plus),  self,
-                  activated=lambda: self._step_pwm(+1))
-        QShortcut(QKeySequence(Qt.Key.Key_Minus), self,
-                  activated=lambda: self._step_pwm(-1))
-        QShortcut(QKeySequence(Qt.Key.Key_Space), self,
-                  activated=self._apply_vibration)
-        QShortcut(QKeySequence(Qt.Key.Key_Escape), self,
-                  activated=self.close)
-
-
+        # Горячие клавиши. autoRepeat=False: удерживаемая клавиша срабатывает
+        # один раз, а не ~30 раз в секунду с записью кадра в порт на каждый повтор
+        for key, slot in (
+            (Qt.Key.Key_Left,   partial(self._step_motor, -1)),
+            (Qt.Key.Key_Right,  partial(self._step_motor, +1)),
+            (Qt.Key.Key_Plus,   partial(self._step_pwm, +1)),
+            (Qt.Key.Key_Minus,  partial(self._step_pwm, -1)),
+            (Qt.Key.Key_Space,  self._apply_vibration),
+            (Qt.Key.Key_Escape, self.close),
+        ):
+            QShortcut(QKeySequence(key), self, activated=slot, autoRepeat=False,
+                      context=Qt.ShortcutContext.WindowShortcut)
+
+
+    @pyqtSlot(int)
     def _step_motor(self, delta):
         """Сдвигает текущий мотор в списке на delta позиций по кольцу."""
-        i = self.motors.index(self._current_motor)
-        self._current_motor = self.motors[(i + delta) % len(self.motors)]
+        self._idx_motor = (self._idx_motor + delta) % len(self.motors)
+        self._current_motor = self.motors[self._idx_motor]
         self._apply_vibration()
 
+    @pyqtSlot(int)
     def _step_pwm(self, delta):
         """Сдвигает текущий PWM на delta позиций по кольцу."""
         self._idx_pwm = (self._idx_pwm + delta) % len(self.pwms)
         self._apply_vibration()
 
+    @pyqtSlot()
     def _apply_vibration(self):
         """
         Включает вибрацию на текущем моторе с текущим PWM,
         обновляет метку статуса и планирует авто-выключение.
         """
-        arr = np.zeros(self.vibro.n_motors, dtype=np.uint8)
+        arr = self._pwm_buf
+        arr.fill(0)
         arr[self._current_motor] = self.pwms[self._idx_pwm]
-        self.vibro.set_pwm_values(arr)
+        self.vibro.set_pwm_values_async(arr)    # запись в порт — вне GUI‑потока
         # Обновляем статус в UI
         self.lbl_status.setText(
             f"Мотор {self._current_motor}  |  PWM {self.pwms[self._idx_pwm]}"
         )
-        # Авто-выключение через 600 мс
-        QTimer.singleShot(600, self.vibro.reset_pwm_values)
+        # Авто-выключение через 600 мс (прежний отсчёт отменяется)
+        self._off_timer.start()
 
 
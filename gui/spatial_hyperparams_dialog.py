@@ -12,8 +12,7 @@
   6) Кнопка для запуска обучения (SpatialTrainingWindow).
 """
 
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QPainter, QLinearGradient, QColor, QFont
+from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtWidgets import (
     QDialog, QFormLayout, QComboBox, QSpinBox,
     QDialogButtonBox, QVBoxLayout, QLabel,
@@ -21,6 +20,20 @@ from PyQt6.QtWidgets import (
     QPushButton
 )
 
+from gui.background import set_gradient_background
+from gui.fonts import app_font
+
+
+# Допустимые шаги зависят только от делимости на 2 и 3, т. е. от total % 6
+_STEPS_BY_MOD6 = {
+    0: (1, 2, 3),
+    1: (1,),
+    2: (1, 2),
+    3: (1, 3),
+    4: (1, 2),
+    5: (1,),
+}
+
 # Отложенный импорт, чтобы избежать круговой зависимости при тестах
 def _train_window():
     from gui.spatial_training_window import SpatialTrainingWindow
@@ -30,6 +43,29 @@ def _train_window():
 class SpatialHyperparamsDialog(QDialog):
     
     """Диалоговое окно для задания гиперпараметров Spatial-теста."""
+
+    # Единая таблица стилей диалога: Qt разбирает её один раз, а не
+    # отдельный фрагмент на каждую подпись, поле и кнопку.
+    # Кнопки OK/Cancel помечаются динамическим свойством role.
+    _QSS = """
+        QLabel#formLabel {
+            background-color: rgba(255,255,255,0.3);
+            border-radius: 6px; padding:4px 8px;
+            font-size: 14pt; color: #333;
+        }
+        QSpinBox, QComboBox, QPushButton, QLabel#stepNone {
+            background-color: rgba(255,255,255,0.9);
+            border: none; border-radius: 8px;
+            padding: 6px; font-size: 12pt; color: #333;
+        }
+        QPushButton[role="dialogbtn"] { padding: 8px; }
+        QComboBox::drop-down { border: none; }
+        QComboBox QAbstractItemView {
+            background-color: white;
+            border: 1px solid #ccc;
+            padding: 4px;
+        }
+    """
     
     def __init__(self, hyps: dict, parent=None):
         super().__init__(parent)
@@ -39,6 +75,9 @@ class SpatialHyperparamsDialog(QDialog):
         # Делаем копию, чтобы не менять оригинал до подтверждения.
         self.hyps = hyps.copy()
 
+        # Градиентный фон заливает сам Qt по палитре; кисть ставит resizeEvent
+        self.setAutoFillBackground(True)
+
         # ---------- Основной layout диалога----------
         main_layout = QVBoxLayout(self)
         main_layout.setContentsMargins(20, 20, 20, 20)
@@ -51,19 +90,15 @@ class SpatialHyperparamsDialog(QDialog):
         form.setHorizontalSpacing(20)
         form.setVerticalSpacing(12)
 
+        label_font = app_font(14)
+
         def make_label(text: str):
 
-            """Создаёт QLabel с единым стилем для подписей."""
+            """Создаёт QLabel подписи (стиль — правило QLabel#formLabel в _QSS)."""
             
             lbl = QLabel(text)
-            lbl.setStyleSheet(
-                """
-                background-color: rgba(255,255,255,0.3);
-                border-radius: 6px; padding:4px 8px;
-                font-size: 14pt; color: #333;
-                """
-            )
-            lbl.setFont(QFont("", 14))
+            lbl.setObjectName("formLabel")
+            lbl.setFont(label_font)
             lbl.setAlignment(Qt.AlignmentFlag.AlignCenter)
             return lbl
 
@@ -81,31 +116,9 @@ class SpatialHyperparamsDialog(QDialog):
 
         # 3) Шаг моторов (диапазон динамический)
         self.cb_step = QComboBox()
-        # Подготовка внешнего вида combobox как кнопки
-        self.cb_step.setStyleSheet(
-            """
-            QComboBox {
-                background-color: rgba(255,255,255,0.9);
-                border: none; border-radius: 8px;
-                padding: 6px; font-size: 12pt; color: #333;
-            }
-            QComboBox::drop-down { border: none; }
-            QComboBox QAbstractItemView {
-                background-color: white;
-                border: 1px solid #ccc;
-                padding: 4px;
-            }
-            """
-        )
         # Для режима Pairs — отображаем надпись «None»
         self.lbl_step_none = QLabel("None")
-        self.lbl_step_none.setStyleSheet(
-            """
-            background-color: rgba(255,255,255,0.9);
-            border-radius: 8px; padding:6px;
-            font-size: 12pt; color:#333;
-            """
-        )
+        self.lbl_step_none.setObjectName("stepNone")
         step_container = QWidget()
         step_layout = QHBoxLayout(step_container)
         step_layout.setContentsMargins(0, 0, 0, 0)
@@ -131,21 +144,11 @@ class SpatialHyperparamsDialog(QDialog):
         self.cb_mode.addItems(['Pairs', 'Single'])
         initial = self.hyps.get('spatial_mode', 'pairs').capitalize()
         self.cb_mode.setCurrentText(initial)
-        self.cb_mode.setStyleSheet(
-            self.cb_step.styleSheet()
-        )
         form.addRow(make_label("Режим теста:"), self.cb_mode)
 
-        # ---------- Единый стиль для spinbox'ов ----------
+        # ---------- Spinbox'ы без стрелочек (стиль — в _QSS) ----------
         for sb in (self.sb_start, self.sb_end, self.sb_samples, self.sb_pwm):
             sb.setButtonSymbols(QAbstractSpinBox.ButtonSymbols.NoButtons)
-            sb.setStyleSheet(
-                """
-                background-color: rgba(255,255,255,0.9);
-                border: none; border-radius: 8px;
-                padding: 6px; font-size: 12pt; color:#333;
-                """
-            )
 
         # Кнопки OK/Cancel
         buttons = QDialogButtonBox(
@@ -155,24 +158,12 @@ class SpatialHyperparamsDialog(QDialog):
         buttons.accepted.connect(self.accept)
         buttons.rejected.connect(self.reject)
         for btn in buttons.buttons():
-            btn.setStyleSheet(
-                """
-                background-color: rgba(255,255,255,0.9);
-                border: none; border-radius: 8px;
-                padding:8px; font-size:12pt; color:#333;
-                """
-            )
+            btn.setProperty("role", "dialogbtn")    # стиль — в _QSS
 
         main_layout.addLayout(form)
 
         # ---------- Кнопка «Пройти обучение» -----------------------------
-        spin_style = """
-            background-color: rgba(255,255,255,0.9);
-            border:none; border-radius:8px;
-            padding:6px; font-size:12pt; color:#333;
-        """
         self.btn_train = QPushButton("Пройти обучение")
-        self.btn_train.setStyleSheet(spin_style)
 
         hl_train = QHBoxLayout()
         hl_train.addStretch()
@@ -188,47 +179,59 @@ class SpatialHyperparamsDialog(QDialog):
 
         # Связываем события
         self.cb_mode.currentTextChanged.connect(self.on_mode_changed)
+        # Пересчёт шагов откладываем на 150 мс: ввод «24» с клавиатуры
+        # даёт два valueChanged, а список шагов строится один раз.
+        self._range_timer = QTimer(self)
+        self._range_timer.setSingleShot(True)
+        self._range_timer.setInterval(150)
+        self._range_timer.timeout.connect(self._refresh_steps)
+        self._last_allowed: tuple | None = None   # Шаги, сейчас стоящие в cb_step
         self.sb_start.valueChanged.connect(self.on_range_changed)
         self.sb_end.valueChanged.connect(self.on_range_changed)
 
         self.btn_train.clicked.connect(self._start_training)
 
+        # Стили подписей, полей и кнопок — одной таблицей на весь диалог
+        self.setStyleSheet(self._QSS)
+
         # Инициализация состояния
         self.on_mode_changed(initial)
+        # Модуль учебного окна подгружаем заранее, когда цикл событий
+        # освободится, — клик «Начать обучение» не ждёт импорта.
+        QTimer.singleShot(0, _train_window)
 
 
-    def paintEvent(self, _):
-
-        """Градиентный фон"""
-        
-        painter = QPainter(self)
-        grad = QLinearGradient(0, 0, 0, self.height())
-        grad.setColorAt(0.0, QColor("#2ECC71"))
-        grad.setColorAt(1.0, QColor("#1ABC9C"))
-        painter.fillRect(self.rect(), grad)
+    def resizeEvent(self, event):
+        """Растягивает градиент фона на новую высоту окна."""
+        set_gradient_background(self)
+        super().resizeEvent(event)
 
 
-    def compute_allowed_steps(self, total_motors: int) -> list[int]:
+    def compute_allowed_steps(self, total_motors: int) -> tuple[int, ...]:
 
         """
         Возвращает допустимые шаги:
           • всегда 1;
           • 2, если total делится на 2;
           • 3, если total делится на 3.
+        Ответ берётся из готовой таблицы по остатку от деления на 6.
         """
         
-        steps = [1]
-        if total_motors % 2 == 0:
-            steps.append(2)
-        if total_motors % 3 == 0:
-            steps.append(3)
-        return sorted(set(steps))
+        return _STEPS_BY_MOD6[total_motors % 6]
 
 
     def on_range_changed(self, _=None):
 
-        """При изменении диапазона, если режим Single, пересчитывает допустимые шаги."""
+        """При изменении диапазона (пере)запускает отложенный пересчёт шагов."""
 
+        self._range_timer.start()
+
+
+    def _refresh_steps(self):
+
+        """Если режим Single, пересчитывает допустимые шаги."""
+
+        self._range_timer.stop()
         if self.cb_mode.currentText().lower() == 'single':
             self.update_steps()
 
@@ -255,21 +258,31 @@ class SpatialHyperparamsDialog(QDialog):
 
         """Пересчитывает и выставляет значения шага."""
 
-        total = max(1, self.sb_end.value() - self.sb_start.value() + 1)
+        total   = max(1, self.sb_end.value() - self.sb_start.value() + 1)
         allowed = self.compute_allowed_steps(total)
-        self.cb_step.clear()
-        self.cb_step.addItems([str(s) for s in allowed])
-
-        # По умолчанию ставим 2, если есть, иначе первый из списка.
-        if '2' in [str(s) for s in allowed]:
-            self.cb_step.setCurrentText('2')
-        else:
-            self.cb_step.setCurrentText(self.cb_step.itemText(0))
+        # Набор шагов не изменился — список и выбор пользователя не трогаем
+        if allowed == self._last_allowed:
+            return
+        self._last_allowed = allowed
+        strs = [str(s) for s in allowed]
+
+        # Промежуточные currentIndexChanged от clear/addItems никому не нужны.
+        self.cb_step.blockSignals(True)
+        try:
+            self.cb_step.clear()
+            self.cb_step.addItems(strs)
+            # По умолчанию ставим 2, если есть, иначе первый из списка.
+            self.cb_step.setCurrentText('2' if '2' in strs else strs[0])
+        finally:
+            self.cb_step.blockSignals(False)
 
 
     def get_hyps(self) -> dict:
         """Возвращает словарь с актуальными значениями полей диалога."""
-        h = self.hyps
+        # Диапазон только что меняли — шаги пересчитываем сразу, не дожидаясь таймера
+        if self._range_timer.isActive():
+            self._refresh_steps()
+        h = dict(self.hyps)             # копия: self.hyps остаётся исходным
         h['num_motor_start']     = self.sb_start.value()
         h['num_motor_end']       = self.sb_end.value()
         mode = self.cb_mode.currentText().lower()
@@ -291,7 +304,7 @@ class SpatialHyperparamsDialog(QDialog):
             h['use_motors_step']
         ))
         
-        SpatialTrainingWindow = _train_window()           # ленивый импорт
+        SpatialTrainingWindow = _train_window()           # уже импортирован заранее
         
         vibro = getattr(self.parent(), "vibro", None)     # ищем VibroBox у любого из родителей (MainWindow)
         
@@ -9,36 +9,53 @@
   • Прогресс прохождения теста.
   • Кнопку «Стоп» для завершения теста.
 
-Кнопки-ответы и «Стоп» стилизуются внешней функцией apply_style_fn.
+Кнопки-ответы и «Стоп» стилизуются одной таблицей стилей на центральном виджете.
 """
 
-from PyQt6.QtCore import Qt, QRect
-from PyQt6.QtGui import QPainter, QLinearGradient, QColor
+from PyQt6.QtCore import Qt, pyqtSlot
 from PyQt6.QtWidgets import (
-    QMainWindow, QWidget, QLabel, QPushButton,
+    QMainWindow, QWidget, QLabel, QPushButton, QButtonGroup,
     QVBoxLayout, QGridLayout, QHBoxLayout
 )
 
+from gui.background import set_gradient_background
+
 class SpatialProbeWindow(QMainWindow):
 
     """
     Программно собранное окно для Spatial-теста.
-    Кнопки-ответы стилизуются через функцию apply_style_fn.
+    Кнопки стилизуются таблицей _BTN_QSS на центральном виджете.
+    """
+
+    # Стиль всех кнопок окна (как _WIDGET_STYLE главного окна). Задаётся одной
+    # таблицей на центральный виджет, а не отдельным setStyleSheet на кнопку.
+    _BTN_QSS = """
+        QPushButton {
+            background-color: rgba(255,255,255,0.9);
+            border: none;
+            border-radius: 12px;
+            padding: 8px;
+            font-size: 12pt;
+            color: #333;
+        }
     """
     
-    def __init__(self, n_pairs: int, apply_style_fn, parent=None):
+    def __init__(self, n_pairs: int, parent=None):
         super().__init__(parent)
 
-        # Храним функцию стилизации и ссылку на главное окно
-        self._apply_style = apply_style_fn
+        # Храним ссылку на главное окно
         self.main_win = parent
 
+        # Градиентный фон заливает сам Qt по палитре; кисть ставит resizeEvent
+        self.setAutoFillBackground(True)
+
         # Заголовок окна и минимальная ширина
         self.setWindowTitle('Spatial-тест')
         self.setMinimumWidth(500)
 
         # ---------- Центральный виджет и основной layout ----------
         central = QWidget(self)
+        central.setStyleSheet(self._BTN_QSS)
         self.setCentralWidget(central)
         main_v = QVBoxLayout(central)
         main_v.setAlignment(Qt.AlignmentFlag.AlignTop)
@@ -56,15 +73,20 @@ class SpatialProbeWindow(QMainWindow):
         self.grid.setVerticalSpacing(12)
         main_v.addLayout(self.grid)
 
+        # Все кнопки-ответы — в одной группе: id кнопки и есть номер пары,
+        # клик приходит одним сигналом idClicked(int) в слот _on_answer.
+        self._answer_group = QButtonGroup(self)
+        self._answer_group.idClicked.connect(self._on_answer)
+
+        # Кнопки создаются сразу с родителем central: addWidget не делает
+        # для каждой повторную смену родителя (и повторную полировку стиля)
         cols = 4 # Количество столбцов в сетке
-        for i in range(1, n_pairs + 1):
-            btn = QPushButton(str(i), self)
+        # Позиции (ряд, столбец) по порядку номеров пар
+        cells = (divmod(k, cols) for k in range(n_pairs))
+        for i, (r, c) in enumerate(cells, start=1):
+            btn = QPushButton(str(i), central)
             btn.setMinimumSize(90, 60)
-            self._apply_style(btn)
-            # При клике отправляем ответ в worker главного окна
-            btn.clicked.connect(lambda _, v=i: self.main_win.worker.set_answer(v))
-            # Размещение по рядам и столбцам
-            r, c = divmod(i - 1, cols)
+            self._answer_group.addButton(btn, i)
             self.grid.addWidget(btn, r, c)
 
         # ---------- Прогресс ----------
@@ -77,12 +99,18 @@ class SpatialProbeWindow(QMainWindow):
         bottom_h = QHBoxLayout()
         bottom_h.addStretch()
         self.btn_stop = QPushButton('Стоп', self)
-        self._apply_style(self.btn_stop)
         self.btn_stop.clicked.connect(self._stop_test)
         bottom_h.addWidget(self.btn_stop)
         main_v.addLayout(bottom_h)
 
 
+    @pyqtSlot(int)
+    def _on_answer(self, value: int):
+        """Клик по кнопке-ответу: отправляем номер пары в worker главного окна."""
+        self.main_win.worker.set_answer(value)
+
+
+    @pyqtSlot()
     def _stop_test(self):
         
         """
@@ -95,12 +123,9 @@ class SpatialProbeWindow(QMainWindow):
         self.close()
     
     
-    def paintEvent(self, _):
-        
-        """Рисует градиентный фон"""
-        
-        painter = QPainter(self)
-        grad = QLinearGradient(0, 0, 0, self.height())
-        grad.setColorAt(0.0, QColor("#2ECC71"))
-        grad.setColorAt(1.0, QColor("#1ABC9C"))
-        painter.fillRect(QRect(0, 0, self.width(), self.height()), grad)
+    def resizeEvent(self, event):
+
+        """Растягивает градиент фона на новую высоту окна."""
+
+        set_gradient_background(self)
+        super().resizeEvent(event)
@@ -13,12 +13,13 @@
       • Esc   — выход из окна.
 """
 
-from PyQt6.QtCore import Qt, QThread, pyqtSignal
-from PyQt6.QtGui  import QPainter, QLinearGradient, QColor, QShortcut, QKeySequence
+from PyQt6.QtCore import Qt, QElapsedTimer, QThread, QTimer, pyqtSignal, pyqtSlot
 from PyQt6.QtWidgets import QMainWindow, QWidget, QLabel, QVBoxLayout, QPushButton
-import numpy as np, time
+import numpy as np
 
 from core.serial_api import VibroBox
+from gui.background import set_gradient_background
+from gui.fonts import app_font
 
 # ============================================================
 #      Фоновый поток для автоматической демонстрации
@@ -51,28 +52,48 @@ class DemoThread(QThread):
         self.mode = mode
         self.pause = pause
 
+        # Все кадры демонстрации готовим заранее, в порядке показа:
+        # массив (область, мотор области, n_motors), в каждой строке горит один мотор
+        per_area = 2 if mode == 'pairs' else 1
+        seq = np.asarray(motors, dtype=np.intp)[:, None] + np.arange(per_area)
+        self._frames = np.zeros(seq.shape + (vibro.n_motors,), dtype=np.uint8)
+        np.put_along_axis(self._frames, seq[..., None], pwm, axis=-1)
+
+
+    def _sleep_s(self, seconds: float):
+
+        """
+        Пауза в секундах (для VibroBox) по абсолютному расписанию:
+        ждём до момента «предыдущая точка + seconds», а не seconds от «сейчас»,
+        поэтому время записи в порт не накапливается от кадра к кадру.
+        """
+
+        self._due_ms += seconds * 1000
+        delta = int(self._due_ms - self._clock.elapsed())
+        if delta > 0:
+            self.msleep(delta)
+
 
     def run(self):
 
         """Запускает демонстрацию всех областей."""
 
-        arr = np.zeros(self.vibro.n_motors, dtype=np.uint8)
+        pulse = self.vibro.pulse_pwm_values
 
-        for m in self.motors:
+        # Отсчёт расписания — от старта демонстрации
+        self._clock  = QElapsedTimer()
+        self._due_ms = 0.0
+        self._clock.start()
+
+        for area in self._frames:
             if self.mode == 'single':
                 # Включаем только один мотор
-                arr[:] = 0; arr[m] = self.pwm
-                self.vibro.set_pwm_values(arr)
-                time.sleep(self.pause)
-                self.vibro.reset_pwm_values()
+                pulse(area[0], self.pause, self._sleep_s)
             else:   # pairs — вибрация двух соседних моторов попеременно
-                for mot in (m, m + 1):
-                    arr[:] = 0; arr[mot] = self.pwm
-                    self.vibro.set_pwm_values(arr)
-                    time.sleep(self.pause / 2)
-                    self.vibro.reset_pwm_values()
-                    time.sleep(0.1)
-            time.sleep(0.3)
+                for frame in area:
+                    pulse(frame, self.pause / 2, self._sleep_s)
+                    self._sleep_s(0.1)
+            self._sleep_s(0.3)
 
         self.finished_demo.emit()
 
@@ -106,6 +127,24 @@ class SpatialTrainingWindow(QMainWindow):
         self.pwm = pwm
         self.mode = mode
 
+        # Градиентный фон заливает сам Qt по палитре; кисть ставит resizeEvent
+        self.setAutoFillBackground(True)
+
+        # Кадр PWM для ручного режима: выделяется один раз, между нажатиями
+        # гасится только мотор, включённый в прошлый раз
+        self._scratch = np.zeros(vibro.n_motors, dtype=np.uint8)
+        self._last_mot: int | None = None
+
+        # Последовательность вибрации ведёт таймер, а не sleep в GUI-потоке:
+        # _plan — оставшиеся шаги (мотор, сколько мс держать), затем сброс
+        self._plan: list[tuple[int, int]] = []
+        self._seq_timer = QTimer(self)
+        self._seq_timer.setSingleShot(True)
+        self._seq_timer.timeout.connect(self._next_step)
+
+        # Клавиши управления работают только после демонстрации (см. keyPressEvent)
+        self._ready = False
+
         # ---------- UI ----------
         central = QWidget(self)
         self.setCentralWidget(central)
@@ -115,17 +154,19 @@ class SpatialTrainingWindow(QMainWindow):
 
         # Метка с информацией
         self.lbl_info = QLabel("Демонстрация сигналов…", alignment=Qt.AlignmentFlag.AlignCenter)
-        self.lbl_info.setStyleSheet("font-size: 16pt;")
+        self.lbl_info.setFont(app_font(16))
         v.addWidget(self.lbl_info)
 
         # Метка со статусом
         self.lbl_status = QLabel("", alignment=Qt.AlignmentFlag.AlignCenter)
-        self.lbl_status.setStyleSheet("font-size: 14pt;")
+        self.lbl_status.setFont(app_font(14))
         v.addWidget(self.lbl_status)
 
         # Кнопка «Закрыть»
         btn_exit = QPushButton("Закрыть")
-        btn_exit.setStyleSheet("font-size: 12pt;")
+        btn_exit.setFont(app_font(12))
+        # Без фокуса: Space не «нажимает» кнопку, а доходит до keyPressEvent окна
+        btn_exit.setFocusPolicy(Qt.FocusPolicy.NoFocus)
         btn_exit.clicked.connect(self.close)
         v.addWidget(btn_exit)
 
@@ -135,17 +176,15 @@ class SpatialTrainingWindow(QMainWindow):
         self.demo.start()
 
 
-    def paintEvent(self, _):
+    def resizeEvent(self, event):
 
-        """Градиентный фон"""
-        
-        p = QPainter(self)
-        g = QLinearGradient(0, 0, 0, self.height())
-        g.setColorAt(0.0, QColor("#2ECC71"))
-        g.setColorAt(1.0, QColor("#1ABC9C"))
-        p.fillRect(self.rect(), g)
+        """Растягивает градиент фона на новую высоту окна."""
+
+        set_gradient_background(self)
+        super().resizeEvent(event)
 
 
+    @pyqtSlot()
     def _on_demo_finished(self):
         
         """
@@ -165,11 +204,29 @@ class SpatialTrainingWindow(QMainWindow):
         self._idx = 0
         self._apply_vibration()
 
-        # Горячие клавиши
-        QShortcut(QKeySequence(Qt.Key.Key_Left),  self, activated=lambda: self._step(-1))
-        QShortcut(QKeySequence(Qt.Key.Key_Right), self, activated=lambda: self._step(+1))
-        QShortcut(QKeySequence(Qt.Key.Key_Space), self, activated=self._apply_vibration)
-        QShortcut(QKeySequence(Qt.Key.Key_Escape), self, activated=self.close)
+        # Горячие клавиши обрабатывает keyPressEvent
+        self._ready = True
+
+
+    def keyPressEvent(self, event):
+
+        """← / → — смена области, Space — повтор, Esc — выход."""
+
+        if self._ready and not event.modifiers() & ~Qt.KeyboardModifier.KeypadModifier:
+            k = event.key()
+            if k == Qt.Key.Key_Left:
+                self._step(-1)
+                return
+            if k == Qt.Key.Key_Right:
+                self._step(+1)
+                return
+            if k == Qt.Key.Key_Space:
+                self._apply_vibration()
+                return
+            if k == Qt.Key.Key_Escape:
+                self.close()
+                return
+        super().keyPressEvent(event)
 
 
     def _step(self, delta: int):
@@ -180,29 +237,44 @@ class SpatialTrainingWindow(QMainWindow):
         self._apply_vibration()
 
 
+    def _frame(self, mot: int) -> np.ndarray:
+
+        """Кадр, где включён только мотор mot (O(1): правим две ячейки)."""
+
+        buf = self._scratch
+        if self._last_mot is not None:
+            buf[self._last_mot] = 0
+        buf[mot] = self.pwm
+        self._last_mot = mot
+        return buf
+
+
     def _apply_vibration(self):
 
         """
         Включает вибрацию для текущей области (одиночной или пары),
         обновляет lbl_status и выключает моторы с задержкой.
+        Новое нажатие прерывает ещё не доигранную последовательность.
         """
 
-        arr = np.zeros(self.vibro.n_motors, dtype=np.uint8)
-        
+        m = self.motors[self._idx]
         if self.mode == 'single':
-            mot = self.motors[self._idx]
-            arr[mot] = self.pwm
             self.lbl_status.setText(f"Номер области: {self._idx + 1}")
-            self.vibro.set_pwm_values(arr)
-        else:   # 'pairs'
-            m = self.motors[self._idx]
-            for mot in (m, m + 1):
-                arr[:] = 0
-                arr[mot] = self.pwm
-                self.vibro.set_pwm_values(arr)
-                time.sleep(0.25)
+            self._plan = [(m, 200)]
+        else:   # 'pairs' — моторы пары по очереди
             self.lbl_status.setText(f"Номер области: {self._idx + 1}  (пара)")
-        
-        # После короткой паузы отключаем моторы
-        QThread.msleep(200)
-        self.vibro.reset_pwm_values()
+            self._plan = [(m, 250), (m + 1, 450)]
+        self._next_step()
+
+
+    @pyqtSlot()
+    def _next_step(self):
+
+        """Шаг последовательности: включает следующий мотор или гасит все."""
+
+        if not self._plan:
+            self.vibro.reset_pwm_values_async()
+            return
+        mot, hold_ms = self._plan.pop(0)
+        self.vibro.set_pwm_values_async(self._frame(mot))
+        self._seq_timer.start(hold_ms)
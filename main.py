@@ -10,11 +10,14 @@
 """
 
 import sys
+from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont
 from PyQt6.QtWidgets import QApplication
 from gui.main_window import MainWindow
 
 if __name__ == '__main__':
+    # Сжатие частых событий (resize, движение мыши) — до создания QApplication
+    QApplication.setAttribute(Qt.ApplicationAttribute.AA_CompressHighFrequencyEvents, True)
     app = QApplication(sys.argv)
     app.setFont(QFont("Segoe UI", 12))
     win = MainWindow()